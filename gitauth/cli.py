@@ -1,21 +1,27 @@
 """Command-line interface for GitAuth."""
 
+import datetime
 import logging
+import os
 import sys
+import tempfile
+import textwrap
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 import typer
 from rich.console import Console
-from rich.table import Table
 
 from .core.backup import create_backup
-from .core.detect import detect_authors, find_commits_by_author
+from .core.detect import detect_authors, find_commits_by_author, find_commits_by_authors
 from .core.git_utils import GitError, GitRepo
-from .core.rewrite import rewrite_history, RewriteError
-from .core.arrange import calculate_schedule
-import datetime
-import dateutil.parser
+
+# Heavier modules (rich.table, core.rewrite, core.arrange) are imported inside
+# the commands that use them to keep `--help` and `check` startup short.
 
 # Create Typer app
 app = typer.Typer(
@@ -27,14 +33,145 @@ app = typer.Typer(
 # Rich console for pretty output
 console = Console()
 
+# Largest commit callback passed inline in filter-repo's --commit-callback argument;
+# Linux rejects any single argument over 128 KiB, so bigger schedules go in a file
+_INLINE_SCHEDULE_LIMIT = 100_000
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
 
 def setup_logging(verbose: bool = False):
-    """Configure logging based on verbosity."""
+    """
+    Configure logging based on verbosity.
+
+    Safe to call repeatedly: the level is always applied, and the handler is
+    only installed once (logging.basicConfig would ignore a second call).
+    """
     level = logging.DEBUG if verbose else logging.INFO
-    logging.basicConfig(level=level, format="%(levelname)s: %(message)s")
+    root = logging.getLogger()
+    root.setLevel(level)
+
+    if not root.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+        root.addHandler(handler)
+
+
+class _RecordBuffer(logging.Handler):
+    """Logging handler that keeps records in memory."""
+
+    def __init__(self):
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+@contextmanager
+def _hold_logs(name: str) -> Iterator[None]:
+    """
+    Hold back a logger's records for the duration of the block, then emit them.
+
+    Used while a prompt is open, so output from background work does not get
+    mixed into the line the user is typing on.
+
+    Args:
+        name: Name of the logger to hold
+    """
+    held_logger = logging.getLogger(name)
+    buffer = _RecordBuffer()
+    propagate = held_logger.propagate
+    held_logger.addHandler(buffer)
+    held_logger.propagate = False
+    try:
+        yield
+    finally:
+        held_logger.removeHandler(buffer)
+        held_logger.propagate = propagate
+        for record in buffer.records:
+            held_logger.handle(record)
+
+
+def _truncate(text: str, width: int = 60) -> str:
+    """Shorten text to width characters, marking the cut with an ellipsis."""
+    return text if len(text) <= width else text[:width] + "..."
+
+
+def _print_commit_table(commits: list[dict]) -> None:
+    """Render commits as one table, built from precomputed rows and printed once."""
+    from rich.table import Table
+
+    rows = [
+        (c["hash"][:8], c["author_name"], c["author_email"], _truncate(c["subject"]))
+        for c in commits
+    ]
+
+    table = Table(show_header=True, header_style="bold cyan")
+    table.add_column("Commit", style="yellow", width=10)
+    table.add_column("Author", style="green")
+    table.add_column("Email", style="blue")
+    table.add_column("Subject", style="white", overflow="fold")
+
+    for row in rows:
+        table.add_row(*row)
+
+    console.print(table)
+
+
+def _format_git_date(git_date: bytes) -> str:
+    """
+    Format a raw git date (b"<unix timestamp> <+HHMM>") as ISO 8601 in its own offset.
+
+    Args:
+        git_date: Date in git's raw format
+
+    Returns:
+        ISO 8601 date string
+    """
+    timestamp, offset = git_date.split()
+    minutes = int(offset[1:3]) * 60 + int(offset[3:5])
+    if offset[:1] == b"-":
+        minutes = -minutes
+    tz = datetime.timezone(datetime.timedelta(minutes=minutes))
+    return datetime.datetime.fromtimestamp(int(timestamp), tz).isoformat()
+
+
+def _commit_callback(load_schedule: str) -> str:
+    """
+    Build the filter-repo commit callback that sets each commit's scheduled date.
+
+    filter-repo runs the body once per commit with persistent globals, so the
+    schedule is loaded on the first call only.
+
+    Args:
+        load_schedule: Python code that defines SCHEDULE
+
+    Returns:
+        Callback body for --commit-callback
+    """
+    return f"""
+global SCHEDULE
+try:
+    SCHEDULE
+except NameError:
+{textwrap.indent(load_schedule, "    ")}
+date_bytes = SCHEDULE.get(commit.original_id)
+if date_bytes:
+    commit.author_date = date_bytes
+    commit.committer_date = date_bytes
+"""
+
+
+def _parse_date(value: str) -> datetime.date:
+    """Parse a YYYY-MM-DD date, falling back to dateutil for other formats."""
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        import dateutil.parser
+
+        return dateutil.parser.parse(value).date()
 
 
 @app.command()
@@ -50,6 +187,8 @@ def check(
     """
     List all unique authors in the repository.
     """
+    from rich.table import Table
+
     setup_logging(verbose)
 
     try:
@@ -59,6 +198,8 @@ def check(
             console.print("[yellow]Repository has no commits yet[/yellow]")
             raise typer.Exit(0)
 
+        repo.ensure_commit_graph()
+
         console.print("[bold]Detecting authors...[/bold]")
         authors = detect_authors(repo, branch=branch)
 
@@ -68,13 +209,15 @@ def check(
 
         console.print(f"\n[bold green]Found {len(authors)} unique author(s):[/bold green]\n")
 
+        rows = [(a.name, a.email) for a in sorted(authors, key=lambda a: a.name.lower())]
+
         # Create table
         table = Table(show_header=True, header_style="bold cyan")
         table.add_column("Name", style="green")
         table.add_column("Email", style="blue")
 
-        for author in sorted(authors, key=lambda a: a.name.lower()):
-            table.add_row(author.name, author.email)
+        for row in rows:
+            table.add_row(*row)
 
         console.print(table)
 
@@ -119,6 +262,8 @@ def dry_run(
             console.print("[yellow]Repository has no commits yet[/yellow]")
             raise typer.Exit(0)
 
+        repo.ensure_commit_graph()
+
         console.print("[bold]Finding commits...[/bold]")
 
         # support --map-all as an alias for --all
@@ -142,23 +287,8 @@ def dry_run(
                 indices = [int(x.strip()) - 1 for x in choice.split(",")]
                 chosen_authors = [sorted_authors[idx] for idx in indices]
 
-                # For dry-run, show commits from all selected authors
-                commits = []
-                for author in chosen_authors:
-                    author_commits = find_commits_by_author(
-                        repo, email=author.email, name=author.name, limit=limit, branch=branch
-                    )
-                    commits.extend(author_commits)
-
-                # Remove duplicates and limit
-                seen = set()
-                unique_commits = []
-                for c in commits:
-                    if c["hash"] not in seen:
-                        seen.add(c["hash"])
-                        unique_commits.append(c)
-
-                commits = unique_commits[:limit]
+                # For dry-run, show commits from all selected authors, found in one git log
+                commits = find_commits_by_authors(repo, chosen_authors, limit=limit, branch=branch)
 
                 if not commits:
                     console.print("[yellow]No matching commits found[/yellow]")
@@ -171,26 +301,8 @@ def dry_run(
                     f"\n[bold green]Found {total_count} commit(s) from selected author(s). Showing first {showing}:[/bold green]\n"
                 )
 
-                # Create table
-                table = Table(show_header=True, header_style="bold cyan")
-                table.add_column("Commit", style="yellow", width=10)
-                table.add_column("Author", style="green")
-                table.add_column("Email", style="blue")
-                table.add_column("Subject", style="white", overflow="fold")
-
-                for commit in commits[:limit]:
-                    table.add_row(
-                        commit["hash"][:8],
-                        commit["author_name"],
-                        commit["author_email"],
-                        (
-                            commit["subject"][:60] + "..."
-                            if len(commit["subject"]) > 60
-                            else commit["subject"]
-                        ),
-                    )
-
-                console.print(table)
+                # commits is already capped at limit above
+                _print_commit_table(commits)
 
                 if total_count > limit:
                     console.print(f"\n[dim]... and {total_count - limit} more commits[/dim]")
@@ -225,26 +337,7 @@ def dry_run(
             f"\n[bold green]Found {total_count} commit(s). Showing first {showing}:[/bold green]\n"
         )
 
-        # Create table
-        table = Table(show_header=True, header_style="bold cyan")
-        table.add_column("Commit", style="yellow", width=10)
-        table.add_column("Author", style="green")
-        table.add_column("Email", style="blue")
-        table.add_column("Subject", style="white", overflow="fold")
-
-        for commit in commits[:limit]:
-            table.add_row(
-                commit["hash"][:8],
-                commit["author_name"],
-                commit["author_email"],
-                (
-                    commit["subject"][:60] + "..."
-                    if len(commit["subject"]) > 60
-                    else commit["subject"]
-                ),
-            )
-
-        console.print(table)
+        _print_commit_table(commits[:limit])
 
         if total_count > limit:
             console.print(f"\n[dim]... and {total_count - limit} more commits[/dim]")
@@ -329,6 +422,8 @@ def rewrite(
     """
     Rewrite Git commit authors and committers.
     """
+    from .core.rewrite import rewrite_history, rewrite_history_multi, RewriteError
+
     setup_logging(verbose)
 
     try:
@@ -415,12 +510,8 @@ def rewrite(
 
             console.print(f"\n[bold green]New identity:[/bold green] {new_name} <{new_email}>")
 
-            # For rewrite logic: we need to handle multiple old authors
-            # We'll create a mailmap or run multiple rewrites
-            # For now, let's rewrite each old author to the new one
-            # This will be handled by passing the info to rewrite_history
-
-            # Store the selections for processing
+            # All selected old authors are rewritten to the new identity in a
+            # single history pass through rewrite_history_multi
             selected_old_authors = chosen_old_authors
 
         # Validate inputs
@@ -458,10 +549,8 @@ def rewrite(
 
         # Count affected commits
         if choose_old and "selected_old_authors" in locals():
-            total_count = 0
-            for a in selected_old_authors:
-                count = repo.count_commits_by_author(email=a.email, name=a.name)
-                total_count += count
+            counts = repo.count_commits_by_all_authors()
+            total_count = sum(counts.get((a.email, a.name), 0) for a in selected_old_authors)
             console.print(
                 f"\n[bold yellow]This will affect approximately {total_count} commit(s)[/bold yellow]"
             )
@@ -477,14 +566,27 @@ def rewrite(
             "This is a destructive operation."
         )
 
-        # Create backup unless disabled
-        if not no_backup:
-            console.print("\n[bold]Creating backup before rewriting...[/bold]")
-            backup_path = create_backup(repo, format="tar.gz")
+        # Create backup unless disabled. It runs in the background while the
+        # user reads the warning and answers the prompt; its log lines are held
+        # back until then so they do not land inside the prompt.
+        backup_future = None
+        with _hold_logs(create_backup.__module__):
+            if not no_backup:
+                console.print("\n[bold]Creating backup before rewriting...[/bold]")
+                backup_executor = ThreadPoolExecutor(max_workers=1)
+                backup_future = backup_executor.submit(create_backup, repo, format="tar.gz")
+                backup_executor.shutdown(wait=False)
+
+            # Confirm
+            confirm = typer.confirm("\nDo you want to proceed?", default=False)
+
+            # Never start rewriting before the backup has completed
+            if backup_future is not None:
+                backup_path = backup_future.result()
+
+        if backup_future is not None:
             console.print(f"[dim]Backup saved to: {backup_path}[/dim]")
 
-        # Confirm
-        confirm = typer.confirm("\nDo you want to proceed?", default=False)
         if not confirm:
             console.print("[yellow]Aborted[/yellow]")
             raise typer.Exit(0)
@@ -493,19 +595,10 @@ def rewrite(
         console.print("\n[bold]Rewriting history...[/bold]")
 
         if choose_old and "selected_old_authors" in locals():
-            # Rewrite multiple authors sequentially
-            for i, old_author in enumerate(selected_old_authors, start=1):
-                console.print(
-                    f"\n[dim]Processing author {i}/{len(selected_old_authors)}: {old_author.name} <{old_author.email}>[/dim]"
-                )
-                rewrite_history(
-                    repo,
-                    old_email=old_author.email,
-                    old_name=old_author.name,
-                    new_name=new_name,
-                    new_email=new_email,
-                    rewrite_all=False,
-                )
+            # Rewrite all selected authors in a single history pass
+            mapping = {(a.email, a.name): (new_name, new_email) for a in selected_old_authors}
+            console.print(f"\n[dim]Processing {len(mapping)} author(s) in a single pass[/dim]")
+            rewrite_history_multi(repo, mapping)
         else:
             rewrite_history(
                 repo,
@@ -533,8 +626,6 @@ def rewrite(
     except Exception as e:
         console.print(f"\n[bold red]Unexpected error:[/bold red] {e}")
         if verbose:
-            import traceback
-
             console.print(traceback.format_exc())
         raise typer.Exit(1)
 
@@ -629,6 +720,9 @@ def arrange(
     skip_weekends: Optional[bool] = typer.Option(
         None, "--skip-weekends/--no-skip-weekends", help="Skip weekends"
     ),
+    uniform: bool = typer.Option(
+        False, "--uniform", help="Space commits evenly instead of by size (skips the size scan)"
+    ),
     force: bool = typer.Option(False, "--force", "-f", help="Force execution without confirmation"),
     path: Optional[Path] = typer.Option(
         None, "--path", "-p", help="Path to Git repository (default: current directory)"
@@ -638,6 +732,8 @@ def arrange(
     """
     Arrange commit dates over a specified timeline.
     """
+    from .core.arrange import calculate_schedule
+
     setup_logging(verbose)
 
     try:
@@ -647,15 +743,15 @@ def arrange(
             console.print("[yellow]Repository has no commits yet[/yellow]")
             raise typer.Exit(0)
 
-        # Determine Commit Range
-        git_range = None
+        # Determine Commit Range (revision arguments for git log)
+        git_revs: list[str] = []
 
         # If --commits is provided, use it (shortcut)
         if commits:
             if commits.isdigit():
-                git_range = f"HEAD~{commits}..HEAD"
+                git_revs = [f"HEAD~{commits}..HEAD"]
             else:
-                git_range = commits
+                git_revs = [commits]
         else:
             # Interactive / Explict Start & End
             if not start_commit:
@@ -670,17 +766,25 @@ def arrange(
             # Validation
             console.print("[dim]Validating commits...[/dim]")
 
-            # 1. Verify existence
-            for name, rev in [("Start", start_commit), ("End", end_commit)]:
-                res = repo._run_command(["git", "rev-parse", "--verify", rev], check=False)
-                if res.returncode != 0:
-                    console.print(f"[bold red]Error:[/bold red] {name} commit '{rev}' not found.")
+            # 1. Resolve start and end through one long-running
+            # `git cat-file --batch-check` process
+            with repo:
+                start_hash = repo.resolve(f"{start_commit}^{{commit}}")
+                if not start_hash:
+                    console.print(
+                        f"[bold red]Error:[/bold red] Start commit '{start_commit}' not found."
+                    )
                     raise typer.Exit(1)
-                # Update to full hash
-                if name == "Start":
-                    start_commit = res.stdout.strip()
-                if name == "End":
-                    end_commit = res.stdout.strip()
+
+                end_hash = repo.resolve(f"{end_commit}^{{commit}}")
+                if not end_hash:
+                    console.print(
+                        f"[bold red]Error:[/bold red] End commit '{end_commit}' not found."
+                    )
+                    raise typer.Exit(1)
+
+            # Update to full hashes
+            start_commit, end_commit = start_hash, end_hash
 
             # 2. Verify ancestry (start must be ancestor of end)
             res = repo._run_command(
@@ -693,20 +797,11 @@ def arrange(
                 raise typer.Exit(1)
 
             # Construct range
-            # We want to INCLUDE start_commit.
-            # git log start..end excludes start.
-            # So we use start^..end, but if start is root, this fails.
-            # Safe way: git log --ancestry-path start..end + explicit start?
-            # Or check if start has parent.
-
-            has_parent = (
-                repo._run_command(["git", "rev-parse", f"{start_commit}^"], check=False).returncode
-                == 0
-            )
-            if has_parent:
-                git_range = f"{start_commit}^..{end_commit}"
-            else:
-                git_range = end_commit  # All commits up to end (root included)
+            # We want to INCLUDE start_commit: git log start..end excludes it,
+            # so exclude start's parents instead. start^@ names all parents of
+            # start and expands to nothing for a root commit, so no separate
+            # parent probe is needed.
+            git_revs = [end_commit, f"^{start_commit}^@"]
 
         # Interactive Time/Date setup
         if not start_date:
@@ -724,8 +819,6 @@ def arrange(
             end_time = typer.prompt("End time for potential commits (HH:MM)", default="17:00")
 
         if not timezone:
-            import time
-
             # Default to empty string to indicate "Local" to the backend
             # We can show a hint in the prompt
             timezone = typer.prompt("Enter timezone (leave empty for Local)", default="")
@@ -735,55 +828,58 @@ def arrange(
 
         # Process Inputs
         try:
-            s_date = dateutil.parser.parse(start_date).date()
-            e_date = dateutil.parser.parse(end_date).date()
+            s_date = _parse_date(start_date)
+            e_date = _parse_date(end_date)
         except Exception:
             console.print("[bold red]Invalid date format[/bold red]")
             raise typer.Exit(1)
 
+        repo.ensure_commit_graph()
+
         # Fetch commits
         console.print("[bold]Fetching commits...[/bold]")
 
-        # Get list of commits in the range
-        cmd = ["git", "log", "--format=%H", git_range]
-        result = repo._run_command(cmd, check=False)
-        if result.returncode != 0:
-            console.print(f"[bold red]Error listing commits: {result.stderr}[/bold red]")
-            raise typer.Exit(1)
-
-        commit_hashes = result.stdout.strip().splitlines()
-
-        # If using start_commit (manual range), verify start_commit is in the list
-        # If we used start^..end, it should be.
-        # If start was root, we used 'end', which includes root.
-
-        if not commit_hashes:
-            console.print("[yellow]No commits found in range[/yellow]")
-            raise typer.Exit(0)
-
-        commit_objects = [{"hash": h} for h in commit_hashes]
+        # Commit hashes in the range, read from git log without buffering its output
+        commit_hashes = repo.iter_log_hashes(*git_revs)
 
         # Calculate Schedule
+        # calculate_schedule reads and sizes the whole range before its first date;
+        # the preview takes five dates and the rest are collected after confirmation.
         console.print("[bold]Calculating new schedule...[/bold]")
-        schedule = calculate_schedule(
-            repo, commit_objects, s_date, e_date, start_time, end_time, timezone, skip_weekends
+        scheduled = calculate_schedule(
+            repo,
+            commit_hashes,
+            s_date,
+            e_date,
+            start_time,
+            end_time,
+            timezone,
+            skip_weekends,
+            weighting="uniform" if uniform else "size",
         )
+        preview = list(islice(scheduled, 5))
 
-        console.print(f"[bold green]Scheduled {len(schedule)} commits.[/bold green]")
+        if not preview:
+            console.print("[yellow]No commits found in range[/yellow]")
+            raise typer.Exit(0)
 
         # Preview
         console.print("\n[bold]Preview (first 5):[/bold]")
-        preview_count = 0
-        for h, date_str in schedule.items():
-            if preview_count < 5:
-                console.print(f"  {h[:8]} -> {date_str}")
-                preview_count += 1
+        console.print(
+            "\n".join(f"  {h[:8]} -> {_format_git_date(git_date)}" for h, git_date in preview),
+            markup=False,
+            highlight=False,
+        )
 
         if not force:
             if not typer.confirm("\nDo you want to apply these changes?"):
                 console.print("[yellow]Aborted[/yellow]")
                 raise typer.Exit(0)
 
+        schedule = dict(preview)
+        schedule.update(scheduled)
+        console.print(f"[bold green]Scheduled {len(schedule)} commits.[/bold green]")
+
         # Apply changes
         # check if filter-repo is available
         if not repo.has_filter_repo():
@@ -791,86 +887,60 @@ def arrange(
             console.print("Please install it: pip install git-filter-repo")
             raise typer.Exit(1)
 
-        # We need to construct a robust way to pass this map to filter-repo.
-        # It supports --commit-callback "..."
-        # We can inline the schedule map into the callback script?
-        # Or write a callback python script to a temp file.
-
-        import json
-        import tempfile
-
         # Backup Remotes
         # git-filter-repo deletes remotes; we need to restore them.
-        remotes = {}
         try:
-            remote_lines = (
-                repo._run_command(["git", "remote", "-v"], check=False).stdout.strip().splitlines()
-            )
-            for line in remote_lines:
-                if not line:
-                    continue
-                parts = line.split()
-                if len(parts) >= 2:
-                    name, url = parts[0], parts[1]
-                    # Only Store fetch or push? Usually they are same or pairs.
-                    # We can just store one URL per name (last one overwrites, usually fine as push url is what matters? or we add both?)
-                    # simpler: just `git remote add name url` works for single url.
-                    remotes[name] = url
+            remotes = repo.get_remotes()
         except Exception:
+            remotes = {}
             console.print(
                 "[yellow]Warning: Could not backup remotes. You may need to re-add them.[/yellow]"
             )
 
-        # Create a temp file with the mapping
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            json.dump(schedule, f)
-            schedule_path = f.name
-
-        # Create the callback script
-        callback_script = f"""
-import json
-import datetime
-try:
-    with open(r'{schedule_path}', 'r') as f:
-        schedule = json.load(f)
-except Exception:
-    schedule = {{}}
-
-commit_hash = commit.original_id.decode('utf-8')
-if commit_hash in schedule:
-    new_date_iso = schedule[commit_hash]
-    
-    dt = datetime.datetime.fromisoformat(new_date_iso)
-    timestamp = int(dt.timestamp())
-    offset = dt.strftime('%z')
-    date_bytes = f"{{timestamp}} {{offset}}".encode('ascii')
-    
-    commit.author_date = date_bytes
-    commit.committer_date = date_bytes
-"""
-        # Run filter-repo
-        # git filter-repo --commit-callback "..." --force
-        console.print("\n[bold]Rewriting history...[/bold]")
+        # The schedule is a Python module holding a bytes dict literal, keyed like
+        # commit.original_id, so filter-repo needs no decoding or parsing per commit
+        schedule_source = (
+            "SCHEDULE = {\n"
+            + "".join(
+                f"    {commit_hash.encode('ascii')!r}: {git_date!r},\n"
+                for commit_hash, git_date in schedule.items()
+            )
+            + "}\n"
+        )
 
-        cmd = ["git", "filter-repo", "--force", "--commit-callback", callback_script]
+        schedule_path = None
+        try:
+            callback_script = _commit_callback(schedule_source)
+            if len(callback_script) > _INLINE_SCHEDULE_LIMIT:
+                # Too large for the command line: write it out and run it from there
+                fd, schedule_path = tempfile.mkstemp(prefix="gitauth-", suffix=".py")
+                with os.fdopen(fd, "w") as f:
+                    f.write(schedule_source)
+                callback_script = _commit_callback(
+                    f"with open({schedule_path!r}, 'rb') as f:\n"
+                    f"    exec(compile(f.read(), {schedule_path!r}, 'exec'), globals())\n"
+                )
 
-        result = repo._run_command(cmd, check=False)
+            # Run filter-repo
+            # git filter-repo --commit-callback "..." --force
+            console.print("\n[bold]Rewriting history...[/bold]")
 
-        # Cleanup temp file
-        import os
+            cmd = ["git", "filter-repo", "--force", "--commit-callback", callback_script]
 
-        try:
-            os.unlink(schedule_path)
-        except:
-            pass
+            result = repo._run_command(cmd, check=False, close_fds=True)
+        finally:
+            # Cleanup temp file, also when writing it or the rewrite fails
+            if schedule_path:
+                try:
+                    os.unlink(schedule_path)
+                except OSError:
+                    pass
 
         # Restore Remotes
         if remotes:
             console.print("[dim]Restoring remotes...[/dim]")
-            for name, url in remotes.items():
-                # check if exists first? filter-repo should have deleted them.
-                # git remote add name url
-                repo._run_command(["git", "remote", "add", name, url], check=False)
+            # Only those filter-repo actually removed are added back
+            repo.add_remotes(remotes)
 
         if result.returncode != 0:
             console.print(f"[bold red]Error rewriting history: {result.stderr}[/bold red]")
@@ -886,8 +956,6 @@ if commit_hash in schedule:
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] {e}")
         if verbose:
-            import traceback
-
             console.print(traceback.format_exc())
         raise typer.Exit(1)
 
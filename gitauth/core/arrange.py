@@ -3,42 +3,245 @@ Core logic for arranging commit dates.
 """
 
 import logging
-import random
+import os
 import datetime
-from typing import List, Optional, Dict
-import dateutil.parser
-import pytz
+import functools
+import re
+from concurrent.futures import ThreadPoolExecutor
+from itertools import accumulate
+from typing import Iterable, Iterator, Literal, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from .git_utils import GitRepo, GitError
 
 logger = logging.getLogger(__name__)
 
+# Commit sizes cached between runs, stored inside the .git directory
+WEIGHTS_CACHE_FILE = "gitauth-weights.json"
+
+# Marks the start of each commit's block in the bulk numstat output
+_COMMIT_MARKER = b"__COMMIT__ "
+
+# "<added>\t<deleted>\t<path>" numstat lines; anchored so long paths are never scanned.
+# Binary files report "-" for both counts and add nothing to the size.
+_NUMSTAT_RE = re.compile(rb"^(\d+|-)\t(\d+|-)\t", re.MULTILINE)
+
+# Hashes passed per git log call, keeping the command line well under ARG_MAX
+_NUMSTAT_BATCH_SIZE = 1000
+
+
+def _numstat_bulk(repo: GitRepo, hashes: list[str]) -> dict[str, int]:
+    """
+    Get the number of changed lines (additions + deletions) for many commits.
+
+    Each `git log --no-walk --numstat` call covers a whole batch of hashes
+    instead of one `git show` per commit, and batches run concurrently since
+    most of their time is spent inflating objects inside git. Merges are
+    measured against their first parent, as `git show --numstat` does. Rename
+    detection is off, so a renamed file counts as its lines deleted plus its
+    lines added.
+
+    Args:
+        repo: GitRepo instance
+        hashes: Commit hashes to measure
+
+    Returns:
+        Mapping of commit hash to changed line count. Commits git could not
+        read are missing from the mapping.
+    """
+    batches = [
+        hashes[i : i + _NUMSTAT_BATCH_SIZE] for i in range(0, len(hashes), _NUMSTAT_BATCH_SIZE)
+    ]
+    if len(batches) <= 1:
+        return _numstat_batch(repo, hashes) if hashes else {}
+
+    sizes: dict[str, int] = {}
+    workers = min(8, os.cpu_count() or 1, len(batches))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for batch_sizes in executor.map(lambda batch: _numstat_batch(repo, batch), batches):
+            sizes.update(batch_sizes)
+    return sizes
+
+
+def _numstat_batch(repo: GitRepo, hashes: list[str]) -> dict[str, int]:
+    """
+    Get changed line counts for one batch of commits with a single git log call.
+
+    Args:
+        repo: GitRepo instance
+        hashes: Commit hashes to measure (at most _NUMSTAT_BATCH_SIZE)
+
+    Returns:
+        Mapping of commit hash to changed line count, empty if git failed
+    """
+    # gc.auto=0: concurrent batches must not each decide to start an auto gc.
+    # "-m --first-parent" diffs merges against their first parent; unlike
+    # --diff-merges=first-parent it is understood by git older than 2.31.
+    result = repo._run_command(
+        [
+            "git",
+            "-c",
+            "gc.auto=0",
+            "log",
+            "--no-walk",
+            "--numstat",
+            "--no-renames",
+            "-m",
+            "--first-parent",
+            f"--format={_COMMIT_MARKER.decode()}%H",
+            *hashes,
+        ],
+        check=False,
+        text=False,
+    )
+    if result.returncode != 0:
+        stderr = result.stderr.decode(errors="replace").strip()
+        logger.warning(f"Could not read commit sizes: {stderr}")
+        return {}
+
+    # Every marker starts a line, so splitting on newline + marker cannot be
+    # confused by a path that contains the marker text
+    sizes: dict[str, int] = {}
+    for block in (b"\n" + result.stdout).split(b"\n" + _COMMIT_MARKER)[1:]:
+        commit_hash, _, numstat = block.partition(b"\n")
+        sizes[commit_hash.decode("ascii")] = sum(
+            int(added) + int(deleted)
+            for added, deleted in _NUMSTAT_RE.findall(numstat)
+            if added != b"-" and deleted != b"-"
+        )
+
+    return sizes
+
+
+def _commit_sizes(repo: GitRepo, hashes: list[str]) -> dict[str, int]:
+    """
+    Get commit sizes, reusing those cached in the git directory.
+
+    A commit's diff never changes, so cached sizes are keyed by hash alone and
+    only commits missing from the cache are measured. The cache is rewritten
+    to hold exactly the commits of the current run, which keeps it small and
+    drops the hashes replaced by a previous rewrite.
+
+    Args:
+        repo: GitRepo instance
+        hashes: Commit hashes to measure
+
+    Returns:
+        Mapping of commit hash to changed line count
+    """
+    cached = repo.read_cache(WEIGHTS_CACHE_FILE)
+    sizes = {h: cached[h] for h in hashes if isinstance(cached.get(h), int)}
+    missing = [h for h in hashes if h not in sizes]
+    if not missing:
+        logger.debug("Using cached commit sizes")
+        return sizes
+
+    sizes.update(_numstat_bulk(repo, missing))
+    repo.write_cache(WEIGHTS_CACHE_FILE, sizes)
+
+    return sizes
+
+
+def _format_offset(offset: Optional[datetime.timedelta]) -> str:
+    """
+    Format a UTC offset the way git stores it (+HHMM / -HHMM).
+
+    Args:
+        offset: UTC offset; None is treated as UTC
+
+    Returns:
+        Offset string, e.g. "+0500"
+    """
+    seconds = int(offset.total_seconds()) if offset else 0
+    sign = "+" if seconds >= 0 else "-"
+    minutes = abs(seconds) // 60
+    return f"{sign}{minutes // 60:02d}{minutes % 60:02d}"
+
+
+def _midnight_offset(day: int, tz: datetime.tzinfo) -> Optional[datetime.timedelta]:
+    """
+    Get the UTC offset at the start of a day.
+
+    Args:
+        day: Proleptic Gregorian ordinal of the day
+        tz: Timezone
+
+    Returns:
+        UTC offset at 00:00 local time on that day
+    """
+    start = datetime.datetime.combine(datetime.date.fromordinal(day), datetime.time(0, 0))
+    return start.replace(tzinfo=tz).utcoffset()
+
+
+@functools.lru_cache(maxsize=32)
+def _resolve_tz(timezone_str: Optional[str]) -> datetime.tzinfo:
+    """
+    Resolve a timezone name to a tzinfo, memoized per name.
+
+    Args:
+        timezone_str: Timezone string (e.g. "UTC"). If None, empty, "local" or
+            "none", the local system timezone is used.
+
+    Returns:
+        tzinfo instance (a zoneinfo zone where available)
+
+    Raises:
+        ValueError: If the timezone is unknown
+    """
+    # Imported here so that importing this module does not load dateutil
+    import dateutil.tz
+
+    if not timezone_str or timezone_str.lower() in ("local", "none", ""):
+        return dateutil.tz.tzlocal()
+
+    try:
+        return ZoneInfo(timezone_str)
+    except (ZoneInfoNotFoundError, ValueError):
+        # Fallback to dateutil which handles more formats/abbreviations sometimes
+        tz = dateutil.tz.gettz(timezone_str)
+        if tz:
+            return tz
+
+        # If still failing, try to see if it's a local abbreviation passed by datetime (like PKT)
+        # Let's default to local if matching current system tz name
+        local_now = datetime.datetime.now().astimezone()
+        if local_now.tzname() == timezone_str:
+            return local_now.tzinfo
+        raise ValueError(f"Unknown timezone: {timezone_str}")
+
 
 def calculate_schedule(
     repo: GitRepo,
-    commits: List[Dict],
+    commits: Iterable[str],
     start_date: datetime.date,
     end_date: datetime.date,
     start_time: str,
     end_time: str,
     timezone_str: Optional[str],
     skip_weekends: bool,
-) -> Dict[str, str]:
+    weighting: Literal["uniform", "size"] = "size",
+) -> Iterator[tuple[str, bytes]]:
     """
     Calculate a new schedule for the given commits.
 
     Args:
         repo: GitRepo instance
-        commits: List of commit dictionaries
+        commits: Iterable of commit hashes (newest first), e.g. from
+            GitRepo.iter_log_hashes(). It is read in full before the first date
+            is yielded, since every date depends on the total weight of the range.
         start_date: Start date for the range
         end_date: End date for the range
         start_time: Daily start time (HH:MM)
         end_time: Daily end time (HH:MM)
         timezone_str: Timezone string (e.g. "UTC"). If None or empty, uses local system timezone.
         skip_weekends: Whether to skip weekends
+        weighting: "size" spaces commits by lines changed; "uniform" spaces them
+            evenly and skips reading commit sizes altogether
 
-    Returns:
-        Dictionary mapping commit hash to new ISO 8601 date string
+    Yields:
+        (commit hash, new date) tuples, oldest commit first. The date is in
+        git's raw b"<unix timestamp> <+HHMM>" form, ready to assign to a
+        filter-repo commit.
     """
     # 1. Parse times
     try:
@@ -47,72 +250,45 @@ def calculate_schedule(
     except ValueError:
         raise ValueError("Invalid time format. Use HH:MM")
 
+    if weighting not in ("uniform", "size"):
+        raise ValueError(f"Unknown weighting: {weighting}")
+
     # Handle Timezone
-    if not timezone_str or timezone_str.lower() in ("local", "none", ""):
-        tz = dateutil.tz.tzlocal()
-    else:
-        try:
-            tz = pytz.timezone(timezone_str)
-        except pytz.UnknownTimeZoneError:
-            # Fallback to dateutil which handles more formats/abbreviations sometimes
-            tz = dateutil.tz.gettz(timezone_str)
-            if not tz:
-                # If still failing, try to see if it's a local abbreviation passed by datetime (like PKT)
-                # In this case simpler to warn and use UTC or Local?
-                # Let's default to local if matching current system tz name
-                local_now = datetime.datetime.now().astimezone()
-                if local_now.tzname() == timezone_str:
-                    tz = local_now.tzinfo
-                else:
-                    raise ValueError(f"Unknown timezone: {timezone_str}")
+    tz = _resolve_tz(timezone_str)
 
     # 2. Generate valid time slots
-    valid_days = []
-    current_date = start_date
-    while current_date <= end_date:
-        if skip_weekends and current_date.weekday() >= 5:  # 5=Sat, 6=Sun
-            current_date += datetime.timedelta(days=1)
-            continue
-
-        valid_days.append(current_date)
-        current_date += datetime.timedelta(days=1)
+    # Days are kept as proleptic Gregorian ordinals; ordinal 1 is a Monday, so
+    # (ordinal - 1) % 7 is the weekday (5=Sat, 6=Sun).
+    valid_days = range(start_date.toordinal(), end_date.toordinal() + 1)
+    if skip_weekends:
+        valid_days = [day for day in valid_days if (day - 1) % 7 < 5]
 
     if not valid_days:
         raise ValueError("No valid days found in the specified range (check weekends/dates)")
 
     # 3. Analyze commits (size) to determine weights
-    # We need to get commit stats (lines changed) for "size"
-    # standard "git log" doesn't give stats easily in one go without parsing --stat
-    # For now, we will approximate size or fetch it.
-    # Let's simple use 1 as base weight + random factor for now, or assume 'size' is passed if we improved get_commit_info
-    # To properly implement "based on total commits sizes", we'd need `git log --numstat` or similar.
-    # Let's iterate and get stats.
+    # The "size" of a commit is its lines changed (additions + deletions),
+    # fetched for all commits at once with `git log --numstat`. With uniform
+    # weighting every commit weighs 1.
+
+    commit_hashes = list(commits)
 
+    if weighting == "size":
+        logger.info("Analyzing commit sizes...")
+        repo.ensure_commit_graph()
+        sizes = _commit_sizes(repo, commit_hashes)
+    else:
+        sizes = {}
+
+    # Input 'commits' is ordered Newest First (standard git log), but the timeline
+    # needs Oldest First to assign earliest dates, so weights are built in reverse.
     commit_weights = []
     total_weight = 0
 
-    logger.info("Analyzing commit sizes...")
-    for commit in commits:
-        # Get stats: git show --numstat --format="" <hash>
-        # Sum of additions + deletions
-        result = repo._run_command(
-            ["git", "show", "--numstat", "--format=", commit["hash"]], check=False
-        )
-        size = 0
-        if result.returncode == 0:
-            for line in result.stdout.strip().split("\n"):
-                parts = line.split()
-                if len(parts) >= 2:
-                    try:
-                        add = int(parts[0]) if parts[0] != "-" else 0
-                        delete = int(parts[1]) if parts[1] != "-" else 0
-                        size += add + delete
-                    except ValueError:
-                        pass
-
+    for commit_hash in reversed(commit_hashes):
         # Avoid 0 size
-        weight = max(1, size)
-        commit_weights.append((commit, weight))
+        weight = max(1, sizes.get(commit_hash, 0))
+        commit_weights.append((commit_hash, weight))
         total_weight += weight
 
     # 4. Distribute commits
@@ -136,84 +312,69 @@ def calculate_schedule(
 
     total_duration_sec = len(valid_days) * day_duration_sec
 
-    # Commits are ordered Newest First usually from git log, but we need Oldest First for timeline
-    # commits list should be sorted by original date or just reverse the input if it's from git log
-    # Let's assume input 'commits' is ordered Newest First (standard git log).
-    # We need to process them Oldest First to assign earliest dates.
-    ordered_commits_weights = list(reversed(commit_weights))
-
-    schedule = {}
-
-    current_cumulative_weight = 0
-
-    # Add some randomness to the timeline distribution so it's not perfectly linear
-    # We can perturb the weight slightly? Or just pick random time in the target window.
-
-    for commit, weight in ordered_commits_weights:
-        # Determine strict range for this commit based on weight
-        # range_start_ratio = current_cumulative_weight / total_weight
-        # range_end_ratio = (current_cumulative_weight + weight) / total_weight
-
-        # To add "random spaces", we can simply respect the strict order but allow gaps.
-        # Actually, "based on total commits sizes" means bigger commits might take "more time" (distance to next commit)?
-        # Or bigger commits happen on days with fewer other commits?
-        # The prompt says: "based on total commits sizes and average size per according to dates and times"
-        # Interpreting this: Bigger commits should spaced out more?
-        # Let's stick to: Gap after commit proportional to commit size.
-
-        gap_share = weight / total_weight
-        allocated_seconds = gap_share * total_duration_sec
-
-        # We place the commit roughly at the end of its allocated block?
-        # Or better: construct a timeline of "points" and map commits to points.
-
-        # Better heuristic:
-        # Map cumulative weight to time.
-        # Target time = Start + (Cumulative Weight / Total Weight) * Total Duration
-        # But this target time needs to be mapped to Valid Days/Hours.
-
-        target_seconds_from_start = (current_cumulative_weight / total_weight) * total_duration_sec
-
+    # Nothing to place (e.g. an empty range); also keeps total_weight non-zero below
+    if not commit_weights:
+        return
+
+    # Offset into the available time for every commit, computed up front with
+    # exact integer arithmetic: each commit starts at (weight of the commits
+    # before it / total weight) of the way through the total duration.
+    target_offsets = [
+        cumulative_weight * total_duration_sec // total_weight
+        for cumulative_weight in accumulate((weight for _, weight in commit_weights), initial=0)
+    ]
+
+    # Unix time and UTC offset at which each valid day's window opens. Only these
+    # are localized (once per day rather than once per commit); commits are then
+    # placed by the seconds elapsed since their day's window opened. That only
+    # holds while the offset stays put, so days on which it changes are flagged.
+    window_start = datetime.time(sh, sm)
+    day_starts = [
+        datetime.datetime.combine(datetime.date.fromordinal(day), window_start, tzinfo=tz)
+        for day in valid_days
+    ]
+    day_start_epochs = [int(day_start.timestamp()) for day_start in day_starts]
+    day_start_suffixes = [_format_offset(day_start.utcoffset()) for day_start in day_starts]
+    day_changes_offset = [
+        _midnight_offset(day, tz) != _midnight_offset(day + 1, tz) for day in valid_days
+    ]
+
+    # "Based on total commits sizes": the gap after each commit is proportional to
+    # its size. The offsets are exact, non-decreasing integers, so only a DST
+    # change can send a timestamp backwards; the previous one is tracked for that.
+    previous_epoch = None
+    previous_target = 0
+    for (commit_hash, _), target_seconds_from_start in zip(commit_weights, target_offsets):
         # Map seconds back to (Day, Time)
-        day_idx = int(target_seconds_from_start // day_duration_sec)
-        seconds_into_day = target_seconds_from_start % day_duration_sec
+        day_idx, seconds_into_day = divmod(target_seconds_from_start, day_duration_sec)
 
         # Clamp day_idx
         if day_idx >= len(valid_days):
             day_idx = len(valid_days) - 1
             seconds_into_day = day_duration_sec - 1  # End of last day
 
-        target_day = valid_days[day_idx]
-
-        # Add start_time offset
-        start_seconds = sh * 3600 + sm * 60
-        final_seconds_of_day = start_seconds + seconds_into_day
-
-        # Add randomness: +/- some variation, but ensure order is kept?
-        # Preserving strict order with randomness is tricky.
-        # Simple approach: The calculated time is the "base".
-        # We can add a small random jitter, but must ensure T(i) < T(i+1).
-        # Since we just need to ensure T(i) >= T(i-1), we can track `last_assigned_time`.
-
-        # Let's finalize the base time first.
-        final_hour = int(final_seconds_of_day // 3600)
-        final_minute = int((final_seconds_of_day % 3600) // 60)
-        final_second = int(final_seconds_of_day % 60)
-
-        dt = datetime.datetime.combine(
-            target_day, datetime.time(final_hour, final_minute, final_second)
-        )
-
-        if hasattr(tz, "localize"):
-            dt = tz.localize(dt)
+        if day_changes_offset[day_idx]:
+            # A DST change on this day: localize the wall-clock time itself (aware
+            # datetime arithmetic is wall-clock). Times skipped or repeated by the
+            # change resolve to standard time, the smaller of the two offsets, as
+            # the pytz-based implementation did.
+            wall_time = day_starts[day_idx] + datetime.timedelta(seconds=seconds_into_day)
+            wall_time = min(wall_time, wall_time.replace(fold=1), key=lambda t: t.utcoffset())
+            epoch = int(wall_time.timestamp())
+            suffix = _format_offset(wall_time.utcoffset())
         else:
-            dt = dt.replace(tzinfo=tz)
-
-        # Jitter?
-        # Optional.
-
-        schedule[commit["hash"]] = dt.isoformat()
-
-        current_cumulative_weight += weight
-
-    return schedule
+            epoch = day_start_epochs[day_idx] + seconds_into_day
+            suffix = day_start_suffixes[day_idx]
+
+        # Wall-clock times just after a spring-forward gap map to instants before
+        # the gap's own (standard time) commits. Those commits follow on from the
+        # previous one at half their scheduled spacing (at least a second), so the
+        # hour after the gap and the next are laid out evenly over the one real
+        # hour left, until the wall-clock times catch up again.
+        if previous_epoch is not None and epoch < previous_epoch:
+            epoch = previous_epoch + max(1, (target_seconds_from_start - previous_target) // 2)
+            suffix = _format_offset(datetime.datetime.fromtimestamp(epoch, tz).utcoffset())
+        previous_epoch = epoch
+        previous_target = target_seconds_from_start
+
+        yield commit_hash, f"{epoch} {suffix}".encode("ascii")
@@ -1,12 +1,20 @@
 """Author detection functionality for Git repositories."""
 
+import functools
+import hashlib
 import logging
-from typing import Optional
+from typing import Iterable, Optional
 
 from .git_utils import GitRepo
 
 logger = logging.getLogger(__name__)
 
+# On-disk author cache, stored inside the repository's .git directory
+AUTHORS_CACHE_FILE = "gitauth-authors.json"
+
+# Characters with special meaning in a POSIX extended regular expression
+_ERE_SPECIAL_CHARS = frozenset('\\.^$|?*+()[]{}')
+
 
 class Author:
     """Represents a Git author/committer."""
@@ -45,6 +53,10 @@ def detect_authors(repo: GitRepo, branch: Optional[str] = None) -> set[Author]:
     """
     Detect all unique authors in the repository.
 
+    Results are cached in memory and in gitauth-authors.json in the git
+    directory, keyed on the commit(s) the scanned refs point to, so a new
+    commit or a rewrite invalidates the cache.
+
     Args:
         repo: GitRepo instance
         branch: Optional branch name to limit search
@@ -54,6 +66,70 @@ def detect_authors(repo: GitRepo, branch: Optional[str] = None) -> set[Author]:
     """
     logger.info("Detecting authors in repository...")
 
+    authors = set(_detect_authors_cached(_RepoKey(repo), branch, _refs_state(repo, branch)))
+
+    logger.info(f"Found {len(authors)} unique authors")
+    return authors
+
+
+def _refs_state(repo: GitRepo, branch: Optional[str]) -> str:
+    """
+    Compute a key identifying the history scanned for a branch (or all refs).
+
+    Args:
+        repo: GitRepo instance
+        branch: Optional branch name
+
+    Returns:
+        Hex digest of the resolved ref hashes
+    """
+    result = repo._run_command(["git", "rev-parse", branch if branch else "--all"])
+    return hashlib.sha1(result.stdout.encode()).hexdigest()
+
+
+class _RepoKey:
+    """Wraps a GitRepo for use as a cache key, comparing and hashing by path only."""
+
+    __slots__ = ("repo",)
+
+    def __init__(self, repo: GitRepo):
+        self.repo = repo
+
+    def __eq__(self, other):
+        return isinstance(other, _RepoKey) and self.repo.path == other.repo.path
+
+    def __hash__(self):
+        return hash(self.repo.path)
+
+
+@functools.lru_cache(maxsize=32)
+def _detect_authors_cached(
+    repo_key: _RepoKey,
+    branch: Optional[str],
+    refs_state: str
+) -> frozenset[Author]:
+    """
+    Detect authors, memoized per repository, branch and ref state.
+
+    The caller's GitRepo is used on a cache miss, so the repository is not
+    opened and validated a second time.
+
+    Args:
+        repo_key: The GitRepo to scan, keyed by its path
+        branch: Optional branch name to limit search
+        refs_state: Key returned by _refs_state()
+
+    Returns:
+        Frozen set of unique Author instances
+    """
+    repo = repo_key.repo
+    cache_key = branch if branch else "--all"
+
+    cached = _load_authors_cache(repo, cache_key, refs_state)
+    if cached is not None:
+        logger.debug("Using cached author list")
+        return cached
+
     # Get all unique authors
     cmd = ["git", "log", "--format=%an|%ae"]
     if branch:
@@ -71,8 +147,53 @@ def detect_authors(repo: GitRepo, branch: Optional[str] = None) -> set[Author]:
                 name, email = parts
                 authors.add(Author(name, email))
 
-    logger.info(f"Found {len(authors)} unique authors")
-    return authors
+    _save_authors_cache(repo, cache_key, refs_state, authors)
+    return frozenset(authors)
+
+
+def _load_authors_cache(
+    repo: GitRepo,
+    cache_key: str,
+    refs_state: str
+) -> Optional[frozenset[Author]]:
+    """
+    Load authors from the on-disk cache if it matches the current ref state.
+
+    Args:
+        repo: GitRepo instance
+        cache_key: Branch name, or "--all"
+        refs_state: Key returned by _refs_state()
+
+    Returns:
+        Frozen set of Author instances, or None on a cache miss
+    """
+    entry = repo.read_cache(AUTHORS_CACHE_FILE).get(cache_key)
+    if not isinstance(entry, dict) or entry.get("refs_state") != refs_state:
+        return None
+    return frozenset(Author(name, email) for name, email in entry.get("authors", []))
+
+
+def _save_authors_cache(
+    repo: GitRepo,
+    cache_key: str,
+    refs_state: str,
+    authors: set[Author]
+) -> None:
+    """
+    Store authors in the on-disk cache.
+
+    Args:
+        repo: GitRepo instance
+        cache_key: Branch name, or "--all"
+        refs_state: Key returned by _refs_state()
+        authors: Authors to store
+    """
+    data = repo.read_cache(AUTHORS_CACHE_FILE)
+    data[cache_key] = {
+        "refs_state": refs_state,
+        "authors": sorted([a.name, a.email] for a in authors),
+    }
+    repo.write_cache(AUTHORS_CACHE_FILE, data)
 
 
 def detect_committers(repo: GitRepo) -> set[Author]:
@@ -104,6 +225,45 @@ def detect_committers(repo: GitRepo) -> set[Author]:
     return committers
 
 
+def _escape_pattern(text: str) -> str:
+    """
+    Escape text so git's extended regex engine matches it literally.
+
+    re.escape() is not used because it also escapes characters such as
+    "-" and " ", whose backslashed forms are undefined in POSIX regexes.
+
+    Args:
+        text: Literal text
+
+    Returns:
+        Escaped pattern
+    """
+    return ''.join('\\' + c if c in _ERE_SPECIAL_CHARS else c for c in text)
+
+
+def _author_pattern(email: Optional[str], name: Optional[str]) -> Optional[str]:
+    """
+    Build a `git log --author` pattern (extended regex) for an author.
+
+    git matches --author against "Name <email>", so when both are given a
+    single anchored pattern requires both to match.
+
+    Args:
+        email: Author email to filter by
+        name: Author name to filter by
+
+    Returns:
+        Pattern string, or None if neither email nor name is given
+    """
+    if email and name:
+        return f"^{_escape_pattern(name)} <{_escape_pattern(email)}>$"
+    elif email:
+        return _escape_pattern(email)
+    elif name:
+        return _escape_pattern(name)
+    return None
+
+
 def find_commits_by_author(
     repo: GitRepo,
     email: Optional[str] = None,
@@ -114,10 +274,13 @@ def find_commits_by_author(
     """
     Find commits by a specific author.
 
+    Author filtering and the limit are applied by git itself, so only
+    matching commits are read back.
+
     Args:
         repo: GitRepo instance
         email: Author email to filter by
-        name: Author name to filter by
+        name: Author name to filter by (an exact identity match if email is also given)
         limit: Maximum number of commits to return
         branch: Optional branch name to limit search
 
@@ -126,37 +289,93 @@ def find_commits_by_author(
     """
     logger.info(f"Finding commits by author (email={email}, name={name})...")
 
-    cmd = ["git", "log", "--format=%H|%an|%ae|%s"]
-    
+    commits = _log_commits(repo, _author_pattern(email, name), limit, branch)
+
+    logger.info(f"Found {len(commits)} commits")
+    return commits
+
+
+def find_commits_by_authors(
+    repo: GitRepo,
+    authors: Iterable[Author],
+    limit: Optional[int] = None,
+    branch: Optional[str] = None
+) -> list[dict]:
+    """
+    Find commits by any of several authors in a single history walk.
+
+    The authors are combined into one anchored alternation, so git matches
+    each commit against all of them at once and returns the commits newest
+    first, without duplicates.
+
+    Args:
+        repo: GitRepo instance
+        authors: Authors to match by exact name and email
+        limit: Maximum number of commits to return
+        branch: Optional branch name to limit search
+
+    Returns:
+        List of commit information dictionaries
+    """
+    alternatives = [
+        f"{_escape_pattern(a.name)} <{_escape_pattern(a.email)}>" for a in authors
+    ]
+    if not alternatives:
+        return []
+
+    logger.info(f"Finding commits by {len(alternatives)} author(s)...")
+
+    pattern = f"^({'|'.join(alternatives)})$"
+    commits = _log_commits(repo, pattern, limit, branch)
+
+    logger.info(f"Found {len(commits)} commits")
+    return commits
+
+
+def _log_commits(
+    repo: GitRepo,
+    pattern: Optional[str],
+    limit: Optional[int],
+    branch: Optional[str]
+) -> list[dict]:
+    """
+    List commits whose author matches an extended regex.
+
+    Args:
+        repo: GitRepo instance
+        pattern: `git log --author` pattern, or None to match every commit
+        limit: Maximum number of commits to return
+        branch: Optional branch name to limit search
+
+    Returns:
+        List of commit information dictionaries
+    """
+    cmd = ["git", "log", "--extended-regexp", "--format=%H%x00%an%x00%ae%x00%s"]
+
     if branch:
         cmd.append(branch)
     else:
         cmd.append("--all")
 
-    if email:
-        cmd.extend(["--author", email])
-    elif name:
-        cmd.extend(["--author", name])
+    if pattern:
+        cmd.append(f"--author={pattern}")
+
+    if limit:
+        cmd.extend(["-n", str(limit)])
 
     result = repo._run_command(cmd)
 
     commits = []
-    for line in result.stdout.strip().split('\n'):
-        if line:
-            parts = line.split('|', 3)
-            if len(parts) >= 4:
-                commit_info = {
-                    'hash': parts[0],
-                    'author_name': parts[1],
-                    'author_email': parts[2],
-                    'subject': parts[3]
-                }
-                commits.append(commit_info)
-
-                if limit and len(commits) >= limit:
-                    break
+    for line in result.stdout.split("\n"):
+        parts = line.split('\x00', 3)
+        if len(parts) == 4:
+            commits.append({
+                'hash': parts[0],
+                'author_name': parts[1],
+                'author_email': parts[2],
+                'subject': parts[3]
+            })
 
-    logger.info(f"Found {len(commits)} commits")
     return commits
 
 
@@ -1,15 +1,38 @@
 """Git utilities for repository operations and validation."""
 
+import functools
+import json
 import logging
 import os
 import re
 import shutil
 import subprocess
+from collections import Counter
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Iterator, Optional
 
 logger = logging.getLogger(__name__)
 
+# Config applied to every git invocation: read the commit-graph and never
+# verify signatures while walking history.
+_GIT_CONFIG_PARAMETERS = "'core.commitGraph=true' 'log.showSignature=false'"
+
+# "remote.<name>.url <url>" lines from `git config --get-regexp`; names may contain dots
+_REMOTE_URL_RE = re.compile(r"^remote\.(.+)\.url (.+)$", re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=None)
+def _git_executable() -> Optional[str]:
+    """Return the absolute path of the git executable, or None if it is not on PATH."""
+    path = shutil.which("git")
+    return os.path.abspath(path) if path else None
+
+
+def _config_quote(value: str) -> str:
+    """Quote a git config value or subsection name, escaping backslashes, quotes and newlines."""
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'"{escaped}"'
+
 
 class GitError(Exception):
     """Base exception for Git-related errors."""
@@ -27,8 +50,41 @@ class GitRepo:
             path: Path to the Git repository. If None, uses current directory.
         """
         self.path = Path(path) if path else Path.cwd()
+        self._commit_graph_written = False
+        self._batch: Optional[subprocess.Popen] = None
+        self._env = self._build_env()
         self._validate_repo()
 
+    def __enter__(self) -> "GitRepo":
+        """Enter a block that may reuse the long-running batch process."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Stop the batch process when leaving the block."""
+        self.close_batch()
+
+    @staticmethod
+    def _build_env() -> dict[str, str]:
+        """
+        Build the environment shared by every git command run for this repository.
+
+        Optional index locks are disabled so read-only commands such as
+        `git status` never write to the index, the pager is never set up, and
+        our config is appended to any GIT_CONFIG_PARAMETERS already set.
+
+        Returns:
+            Environment mapping for subprocess calls
+        """
+        config = os.environ.get("GIT_CONFIG_PARAMETERS")
+        return {
+            **os.environ,
+            "GIT_OPTIONAL_LOCKS": "0",
+            "GIT_PAGER": "cat",
+            "GIT_CONFIG_PARAMETERS": (
+                f"{config} {_GIT_CONFIG_PARAMETERS}" if config else _GIT_CONFIG_PARAMETERS
+            ),
+        }
+
     def _validate_repo(self) -> None:
         """Validate that the path is a Git repository."""
         if not self._is_git_repo():
@@ -43,12 +99,98 @@ class GitRepo:
             capture_output=True
         ).returncode == 0
 
+    @functools.cached_property
+    def _git_dirs(self) -> tuple[Path, Path]:
+        """Resolve the git directory and the common directory with one `git rev-parse`."""
+        result = self._run_command(["git", "rev-parse", "--git-dir", "--git-common-dir"])
+        git_dir, common_dir = result.stdout.splitlines()
+        # Both are relative to self.path unless git printed absolute paths
+        return self.path / git_dir, self.path / common_dir
+
+    @property
+    def git_dir(self) -> Path:
+        """
+        The repository's git directory, as reported by `git rev-parse --git-dir`.
+
+        This is .git for a plain checkout, but also resolves correctly from a
+        subdirectory, in a worktree (.git/worktrees/<name>) and in a submodule
+        (.git/modules/<name>). HEAD, its reflog and gitauth's caches live here.
+        """
+        return self._git_dirs[0]
+
+    @property
+    def git_common_dir(self) -> Path:
+        """
+        The directory holding config, objects and refs shared by all worktrees.
+
+        Same as git_dir except in a linked worktree.
+        """
+        return self._git_dirs[1]
+
+    def read_cache(self, name: str) -> dict:
+        """
+        Read a JSON cache file from the git directory.
+
+        Args:
+            name: File name inside git_dir
+
+        Returns:
+            The cached mapping, or an empty dict if the file is missing or unreadable
+        """
+        try:
+            data = json.loads((self.git_dir / name).read_text())
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def write_cache(self, name: str, data: dict) -> None:
+        """
+        Write a JSON cache file to the git directory.
+
+        A cache only saves time, so a failed write is logged and ignored.
+
+        Args:
+            name: File name inside git_dir
+            data: JSON-serializable mapping to store
+        """
+        try:
+            (self.git_dir / name).write_text(json.dumps(data))
+        except OSError as e:
+            logger.debug(f"Could not write cache {name}: {e}")
+
+    def _spawn_args(self, cmd: list[str], close_fds: bool = False) -> dict:
+        """
+        Build the subprocess arguments for running a command in the repository.
+
+        git is started by absolute path with `-C <repo>` instead of `cwd=`. For
+        short-lived commands inherited descriptors are left open (Python opens
+        its own files and pipes non-inheritable), which lets CPython start git
+        with posix_spawn instead of fork + exec and avoids copying the parent's
+        page tables on each call. The fast path needs glibc 2.24 or newer;
+        elsewhere subprocess falls back to fork + exec with the same results.
+
+        Args:
+            cmd: Command and arguments as a list
+            close_fds: Close all other descriptors in the child, giving up the
+                fast path. Used for long-running children and for history
+                rewrites, which run user code.
+
+        Returns:
+            Keyword arguments for subprocess.run / subprocess.Popen
+        """
+        git = _git_executable()
+        if cmd[0] == "git" and git:
+            return {"args": [git, "-C", str(self.path), *cmd[1:]], "close_fds": close_fds}
+        return {"args": cmd, "cwd": self.path}
+
     def _run_command(
         self,
         cmd: list[str],
         check: bool = True,
         capture_output: bool = True,
-        env: Optional[dict] = None
+        env: Optional[dict] = None,
+        text: bool = True,
+        close_fds: bool = False
     ) -> subprocess.CompletedProcess:
         """
         Run a command in the repository directory.
@@ -57,7 +199,10 @@ class GitRepo:
             cmd: Command and arguments as a list
             check: Whether to raise on non-zero exit code
             capture_output: Whether to capture stdout/stderr
-            env: Optional environment variables
+            env: Optional extra environment variables, merged over the
+                repository environment
+            text: Whether to decode output as text; if False, stdout and stderr are bytes
+            close_fds: Close inherited descriptors in the child (see _spawn_args)
 
         Returns:
             CompletedProcess instance
@@ -66,30 +211,134 @@ class GitRepo:
 
         try:
             result = subprocess.run(
-                cmd,
-                cwd=self.path,
+                **self._spawn_args(cmd, close_fds),
                 check=check,
                 capture_output=capture_output,
-                text=True,
-                env=env
+                text=text,
+                env={**self._env, **env} if env else self._env
             )
             return result
         except subprocess.CalledProcessError as e:
+            stderr = e.stderr.decode(errors="replace") if isinstance(e.stderr, bytes) else e.stderr
             logger.error(f"Command failed: {' '.join(cmd)}")
             logger.error(f"Exit code: {e.returncode}")
-            if e.stderr:
-                logger.error(f"Error output: {e.stderr}")
-            raise GitError(f"Git command failed: {e.stderr}") from e
+            if stderr:
+                logger.error(f"Error output: {stderr}")
+            raise GitError(f"Git command failed: {stderr}") from e
         except FileNotFoundError as e:
             raise GitError(f"Command not found: {cmd[0]}") from e
 
+    def _popen(self, cmd: list[str], **kwargs) -> subprocess.Popen:
+        """
+        Start a long-running command in the repository directory.
+
+        The child does not inherit any other open descriptors: it outlives the
+        call, so the spawn cost matters less than keeping descriptors private.
+
+        Args:
+            cmd: Command and arguments as a list
+            **kwargs: Extra arguments for subprocess.Popen (pipes, text mode)
+
+        Returns:
+            Popen instance
+        """
+        logger.debug(f"Starting command: {' '.join(cmd)}")
+
+        try:
+            return subprocess.Popen(
+                **self._spawn_args(cmd, close_fds=True), env=self._env, **kwargs
+            )
+        except FileNotFoundError as e:
+            raise GitError(f"Command not found: {cmd[0]}") from e
+
+    def open_batch(self) -> None:
+        """
+        Start a persistent `git cat-file --batch-check` process used by resolve().
+
+        Does nothing if the process is already running.
+        """
+        if self._batch is not None and self._batch.poll() is None:
+            return
+
+        self._batch = self._popen(
+            ["git", "cat-file", "--batch-check"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True
+        )
+
+    def close_batch(self) -> None:
+        """Stop the batch process started by open_batch(), if any."""
+        if self._batch is None:
+            return
+
+        batch, self._batch = self._batch, None
+        try:
+            batch.stdin.close()
+            batch.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            batch.kill()
+        finally:
+            batch.stdout.close()
+
+    def resolve(self, rev: str) -> Optional[str]:
+        """
+        Resolve a revision to a full object hash.
+
+        Lookups go through one long-running `git cat-file --batch-check`
+        process instead of spawning git for each revision.
+
+        Args:
+            rev: Revision expression (hash, ref, HEAD~3, abc123^{commit}, ...)
+
+        Returns:
+            Full object hash, or None if the revision does not exist
+        """
+        if not rev or '\n' in rev:
+            return None
+
+        self.open_batch()
+        try:
+            self._batch.stdin.write(rev + '\n')
+            self._batch.stdin.flush()
+            line = self._batch.stdout.readline().rstrip('\n')
+        except OSError as e:
+            self.close_batch()
+            raise GitError(f"git cat-file --batch-check failed: {e}") from e
+
+        # "<hash> <type> <size>" on success, "<rev> missing" / "<rev> ambiguous" otherwise
+        if not line or line.endswith((" missing", " ambiguous")):
+            return None
+        return line.split()[0]
+
     def is_clean(self) -> bool:
         """
         Check if the working directory is clean (no uncommitted changes).
 
+        Tracked files are compared with `git diff-index --quiet HEAD`, which
+        stops at the first difference and does no rename detection, and
+        untracked files are listed without descending into untracked
+        directories. Because diff-index also flags files whose stat data
+        merely changed, a reported difference is confirmed with
+        `git status --porcelain`.
+
         Returns:
             True if clean, False otherwise
         """
+        result = self._run_command(
+            ["git", "diff-index", "--quiet", "HEAD", "--"],
+            check=False
+        )
+        if result.returncode == 0:
+            # Tracked files match HEAD; only untracked files can make the tree dirty
+            untracked = self._run_command(
+                ["git", "ls-files", "--others", "--exclude-standard",
+                 "--directory", "--no-empty-directory"],
+                check=False
+            )
+            return untracked.returncode == 0 and not untracked.stdout.strip()
+
         result = self._run_command(
             ["git", "status", "--porcelain"],
             check=False
@@ -106,6 +355,50 @@ class GitRepo:
         result = self._run_command(["git", "branch", "--show-current"])
         return result.stdout.strip()
 
+    def get_remotes(self) -> dict[str, str]:
+        """
+        Get the configured remotes and their URLs.
+
+        Returns:
+            Mapping of remote name to fetch URL (the last one if several are set)
+        """
+        result = self._run_command(
+            ["git", "config", "--get-regexp", r"^remote\..*\.url$"], check=False
+        )
+        return dict(_REMOTE_URL_RE.findall(result.stdout))
+
+    def add_remotes(self, remotes: dict[str, str]) -> None:
+        """
+        Add the given remotes that are not configured yet, in a single write.
+
+        The sections `git remote add` would create (URL plus the default fetch
+        refspec) are appended directly to the repository config file rather
+        than running one git command per remote. If that file is missing it
+        falls back to `git remote add`.
+
+        Args:
+            remotes: Mapping of remote name to URL
+        """
+        existing = self.get_remotes()
+        missing = {name: url for name, url in remotes.items() if name not in existing}
+        if not missing:
+            return
+
+        config_path = self.git_common_dir / "config"
+        if not config_path.is_file():
+            for name, url in missing.items():
+                self._run_command(["git", "remote", "add", name, url], check=False)
+            return
+
+        block = "".join(
+            f"\n[remote {_config_quote(name)}]\n"
+            f"\turl = {_config_quote(url)}\n"
+            f"\tfetch = {_config_quote(f'+refs/heads/*:refs/remotes/{name}/*')}\n"
+            for name, url in missing.items()
+        )
+        with open(config_path, "a", encoding="utf-8") as f:
+            f.write(block)
+
     def has_commits(self) -> bool:
         """
         Check if the repository has any commits.
@@ -155,6 +448,40 @@ class GitRepo:
         # Try as a standalone command
         return shutil.which("git-filter-repo") is not None
 
+    def ensure_commit_graph(self) -> None:
+        """
+        Write a commit-graph to speed up history scans.
+
+        Runs at most once per GitRepo instance and is skipped when the existing
+        commit-graph is newer than the last movement of HEAD. A stale or missing
+        graph only costs speed, so failures are logged and ignored.
+
+        The graph is stored in objects/info/commit-graph, so later runs
+        (and plain git commands) keep the speedup until history moves again.
+
+        Changed-path Bloom filters are not written: they only help path-limited
+        traversals, which this tool never runs, and computing them costs a tree
+        diff of every commit.
+        """
+        if self._commit_graph_written:
+            return
+        self._commit_graph_written = True
+
+        graph_path = self.git_common_dir / "objects" / "info" / "commit-graph"
+        try:
+            if graph_path.stat().st_mtime >= (self.git_dir / "logs" / "HEAD").stat().st_mtime:
+                logger.debug("commit-graph is up to date")
+                return
+        except OSError:
+            pass
+
+        result = self._run_command(
+            ["git", "commit-graph", "write", "--reachable", "--no-progress"],
+            check=False
+        )
+        if result.returncode != 0:
+            logger.debug(f"Could not write commit-graph: {result.stderr.strip()}")
+
     def validate_email(self, email: str) -> bool:
         """
         Validate email format.
@@ -178,6 +505,36 @@ class GitRepo:
         result = self._run_command(["git", "rev-list", "--all"])
         return result.stdout.strip().split('\n') if result.stdout.strip() else []
 
+    def iter_log_hashes(self, *revs: str) -> Iterator[str]:
+        """
+        Stream commit hashes for a revision range (newest first).
+
+        Hashes are yielded as git produces them instead of buffering the
+        whole log in memory.
+
+        Args:
+            *revs: Revision arguments passed to git log (e.g. "HEAD~5..HEAD")
+
+        Yields:
+            Commit hashes
+
+        Raises:
+            GitError: If git log fails
+        """
+        cmd = ["git", "log", "--format=%H", *revs]
+        proc = self._popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+
+        with proc:
+            for line in proc.stdout:
+                commit_hash = line.strip()
+                if commit_hash:
+                    yield commit_hash
+            stderr = proc.stderr.read()
+
+        if proc.returncode != 0:
+            logger.error(f"Command failed: {' '.join(cmd)}")
+            raise GitError(f"Git command failed: {stderr}")
+
     def get_commit_info(self, commit_hash: str) -> dict:
         """
         Get detailed information about a commit.
@@ -224,6 +581,24 @@ class GitRepo:
         result = self._run_command(cmd)
         return int(result.stdout.strip())
 
+    def count_commits_by_all_authors(self) -> dict[tuple[str, str], int]:
+        """
+        Count commits for every author in a single pass over history.
+
+        Identities are taken as recorded (no .mailmap applied), matching
+        detect_authors().
+
+        Returns:
+            Dictionary mapping (email, name) to number of commits
+        """
+        result = self._run_command(["git", "log", "--all", "--format=%ae%x09%an"])
+        counts = Counter(
+            tuple(line.split('\t', 1))
+            for line in result.stdout.split("\n")
+            if '\t' in line
+        )
+        return dict(counts)
+
     def create_backup_ref(self) -> str:
         """
         Create a backup reference before rewriting history.
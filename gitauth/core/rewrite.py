@@ -1,7 +1,6 @@
 """Git history rewriting functionality using filter-repo or filter-branch."""
 
 import logging
-import os
 import subprocess
 import tempfile
 from pathlib import Path
@@ -52,6 +51,18 @@ class RewriteEngine:
         """
         raise NotImplementedError("Subclasses must implement rewrite()")
 
+    def rewrite_multi(self, mapping: dict[tuple[str, str], tuple[str, str]]) -> None:
+        """
+        Rewrite several authors in a single pass over history.
+
+        Args:
+            mapping: Dictionary mapping (old_email, old_name) to (new_name, new_email)
+
+        Raises:
+            RewriteError: If rewrite fails
+        """
+        raise NotImplementedError("Subclasses must implement rewrite_multi()")
+
 
 class FilterRepoEngine(RewriteEngine):
     """Rewrite engine using git-filter-repo."""
@@ -80,7 +91,30 @@ class FilterRepoEngine(RewriteEngine):
         mailmap_content = self._create_mailmap(
             old_email, old_name, new_name, new_email, rewrite_all
         )
+        self._run_with_mailmap(mailmap_content)
+
+    def rewrite_multi(self, mapping: dict[tuple[str, str], tuple[str, str]]) -> None:
+        """
+        Rewrite several authors using a single git-filter-repo run.
+
+        Args:
+            mapping: Dictionary mapping (old_email, old_name) to (new_name, new_email)
+        """
+        logger.info("Using git-filter-repo for rewriting...")
+
+        lines = [
+            f"{new_name} <{new_email}> {old_name} <{old_email}>"
+            for (old_email, old_name), (new_name, new_email) in mapping.items()
+        ]
+        self._run_with_mailmap('\n'.join(lines))
+
+    def _run_with_mailmap(self, mailmap_content: str) -> None:
+        """
+        Run git-filter-repo with the given mailmap content.
 
+        Args:
+            mailmap_content: Mailmap content as string
+        """
         # Write mailmap to temporary file
         with tempfile.NamedTemporaryFile(mode='w', suffix='.mailmap', delete=False) as f:
             f.write(mailmap_content)
@@ -96,7 +130,7 @@ class FilterRepoEngine(RewriteEngine):
                 "--mailmap", mailmap_path
             ]
 
-            result = self.repo._run_command(cmd, check=False)
+            result = self.repo._run_command(cmd, check=False, close_fds=True)
 
             if result.returncode != 0:
                 raise RewriteError(
@@ -192,21 +226,41 @@ class FilterBranchEngine(RewriteEngine):
             new_email: New author email
             rewrite_all: If True, rewrite all commits regardless of author
         """
-        logger.info("Using git-filter-branch for rewriting...")
-        logger.warning(
-            "git-filter-branch is deprecated. Consider installing git-filter-repo for better performance."
-        )
-
         # Create the filter script
         filter_script = self._create_filter_script(
             old_email, old_name, new_name, new_email, rewrite_all
         )
 
+        self._run_filter_branch(filter_script)
+
+    def rewrite_multi(self, mapping: dict[tuple[str, str], tuple[str, str]]) -> None:
+        """
+        Rewrite several authors using a single git-filter-branch run.
+
+        Args:
+            mapping: Dictionary mapping (old_email, old_name) to (new_name, new_email)
+        """
+        # Create the filter script
+        filter_script = self._create_multi_filter_script(mapping)
+
+        self._run_filter_branch(filter_script)
+
+    def _run_filter_branch(self, filter_script: str) -> None:
+        """
+        Run git-filter-branch with the given env-filter script.
+
+        Args:
+            filter_script: Bash script for --env-filter
+        """
+        logger.info("Using git-filter-branch for rewriting...")
+        logger.warning(
+            "git-filter-branch is deprecated. "
+            "Consider installing git-filter-repo for better performance."
+        )
         logger.debug(f"Filter script:\n{filter_script}")
 
         # Set environment for filter-branch
-        env = os.environ.copy()
-        env['FILTER_BRANCH_SQUELCH_WARNING'] = '1'
+        env = {'FILTER_BRANCH_SQUELCH_WARNING': '1'}
 
         # Remove backup refs if they exist
         self._remove_original_refs()
@@ -221,7 +275,7 @@ class FilterBranchEngine(RewriteEngine):
                 "--", "--branches", "--tags"
             ]
 
-            result = self.repo._run_command(cmd, check=False, env=env)
+            result = self.repo._run_command(cmd, check=False, env=env, close_fds=True)
 
             if result.returncode != 0:
                 raise RewriteError(
@@ -291,6 +345,36 @@ fi
 '''
         return script
 
+    def _create_multi_filter_script(
+        self,
+        mapping: dict[tuple[str, str], tuple[str, str]]
+    ) -> str:
+        """
+        Create bash script for git-filter-branch env-filter covering several authors.
+
+        Args:
+            mapping: Dictionary mapping (old_email, old_name) to (new_name, new_email)
+
+        Returns:
+            Bash script as string
+        """
+        branches = []
+        for (old_email, old_name), (new_name, new_email) in mapping.items():
+            condition = (
+                f'[ "$GIT_AUTHOR_EMAIL" = "{old_email}" ]'
+                f' && [ "$GIT_AUTHOR_NAME" = "{old_name}" ]'
+            )
+            branches.append(f'''{condition}
+then
+    export GIT_AUTHOR_NAME="{new_name}"
+    export GIT_AUTHOR_EMAIL="{new_email}"
+    export GIT_COMMITTER_NAME="{new_name}"
+    export GIT_COMMITTER_EMAIL="{new_email}"
+''')
+
+        # One if/elif chain so each commit is matched against every author in one pass
+        return "\nif " + "elif ".join(branches) + "fi\n"
+
     def _remove_original_refs(self) -> None:
         """Remove refs/original/* references created by filter-branch."""
         try:
@@ -330,6 +414,31 @@ def get_rewrite_engine(repo: GitRepo) -> RewriteEngine:
         return FilterBranchEngine(repo)
 
 
+def _select_engine(repo: GitRepo, use_filter_repo: Optional[bool]) -> RewriteEngine:
+    """
+    Select a rewrite engine, honouring an explicit backend choice.
+
+    Args:
+        repo: GitRepo instance
+        use_filter_repo: Force use of filter-repo (True) or filter-branch (False).
+                        If None, automatically choose based on availability.
+
+    Returns:
+        RewriteEngine instance
+
+    Raises:
+        RewriteError: If filter-repo is forced but not installed
+    """
+    if use_filter_repo is True:
+        if not repo.has_filter_repo():
+            raise RewriteError("git-filter-repo is not installed")
+        return FilterRepoEngine(repo)
+    elif use_filter_repo is False:
+        return FilterBranchEngine(repo)
+    else:
+        return get_rewrite_engine(repo)
+
+
 def rewrite_history(
     repo: GitRepo,
     old_email: Optional[str] = None,
@@ -366,14 +475,7 @@ def rewrite_history(
         raise RewriteError("Must specify old_email, old_name, or use rewrite_all=True")
 
     # Get appropriate engine
-    if use_filter_repo is True:
-        if not repo.has_filter_repo():
-            raise RewriteError("git-filter-repo is not installed")
-        engine = FilterRepoEngine(repo)
-    elif use_filter_repo is False:
-        engine = FilterBranchEngine(repo)
-    else:
-        engine = get_rewrite_engine(repo)
+    engine = _select_engine(repo, use_filter_repo)
 
     # Perform rewrite
     engine.rewrite(
@@ -383,3 +485,37 @@ def rewrite_history(
         new_email=new_email,
         rewrite_all=rewrite_all
     )
+
+
+def rewrite_history_multi(
+    repo: GitRepo,
+    mapping: dict[tuple[str, str], tuple[str, str]],
+    use_filter_repo: Optional[bool] = None
+) -> None:
+    """
+    Rewrite Git history for several authors in a single pass.
+
+    Args:
+        repo: GitRepo instance
+        mapping: Dictionary mapping (old_email, old_name) to (new_name, new_email)
+        use_filter_repo: Force use of filter-repo (True) or filter-branch (False).
+                        If None, automatically choose based on availability.
+
+    Raises:
+        RewriteError: If rewrite fails
+    """
+    # Validate inputs
+    if not mapping:
+        raise RewriteError("Must specify at least one author to rewrite")
+
+    for new_name, new_email in mapping.values():
+        if not new_name or not new_email:
+            raise RewriteError("new_name and new_email are required")
+        if not repo.validate_email(new_email):
+            raise RewriteError(f"Invalid email format: {new_email}")
+
+    # Get appropriate engine
+    engine = _select_engine(repo, use_filter_repo)
+
+    # Perform rewrite
+    engine.rewrite_multi(mapping)
@@ -0,0 +1,406 @@
+"""Tests for arrange module."""
+
+import datetime
+import os
+import tempfile
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import dateutil.tz
+import pytest
+from typer.testing import CliRunner
+
+from gitauth import cli
+from gitauth.core.arrange import (
+    WEIGHTS_CACHE_FILE,
+    _commit_sizes,
+    _format_offset,
+    _numstat_batch,
+    _resolve_tz,
+    calculate_schedule,
+)
+from gitauth.core.git_utils import GitRepo
+
+
+@pytest.fixture
+def temp_git_repo():
+    """Create a temporary Git repository with commits of growing size."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repo_path = Path(tmpdir) / "test_repo"
+        repo_path.mkdir()
+
+        # Initialize git repo
+        os.system(f"cd {repo_path} && git init")
+        os.system(f"cd {repo_path} && git config user.name 'Test User'")
+        os.system(f"cd {repo_path} && git config user.email 'test@example.com'")
+
+        # Commit i adds a file of i lines
+        for i in range(1, 6):
+            test_file = repo_path / f"file{i}.txt"
+            test_file.write_text("".join(f"line {n}\n" for n in range(i)))
+            os.system(f"cd {repo_path} && git add file{i}.txt")
+            os.system(f"cd {repo_path} && git commit -m 'Commit {i}'")
+
+        yield repo_path
+
+
+def test_numstat_batch(temp_git_repo):
+    """Test commit sizes are parsed per commit from one numstat call."""
+    repo = GitRepo(str(temp_git_repo))
+    hashes = repo.get_all_commits()
+
+    # Commit i adds i lines; newest commit first
+    assert _numstat_batch(repo, hashes) == {h: 5 - i for i, h in enumerate(hashes)}
+
+
+def test_numstat_batch_binary_marker_and_merge(temp_git_repo):
+    """Test binary files, marker-like paths and merges are measured correctly."""
+    repo_path = temp_git_repo
+    (repo_path / "image.bin").write_bytes(b"\0\1\2\0")
+    (repo_path / "__COMMIT__ deadbeef").write_text("a\nb\n")
+    os.system(f"cd {repo_path} && git add -A && git commit -m 'Binary and marker'")
+
+    os.system(f"cd {repo_path} && git checkout -b side")
+    (repo_path / "side.txt").write_text("1\n2\n3\n")
+    os.system(f"cd {repo_path} && git add side.txt && git commit -m 'Side'")
+    os.system(f"cd {repo_path} && git checkout -")
+    (repo_path / "main.txt").write_text("1\n")
+    os.system(f"cd {repo_path} && git add main.txt && git commit -m 'Main'")
+    os.system(f"cd {repo_path} && git merge --no-ff side -m 'Merge side'")
+
+    repo = GitRepo(str(repo_path))
+    merge, main, side, binary = (repo.resolve(rev) for rev in ("HEAD", "HEAD^", "side", "side^"))
+
+    sizes = _numstat_batch(repo, [merge, main, side, binary])
+
+    # The binary file adds nothing; the merge counts its first-parent diff only
+    assert sizes == {merge: 3, main: 1, side: 3, binary: 2}
+
+
+def test_commit_sizes_cache(temp_git_repo):
+    """Test commit sizes are cached in the git directory and reused."""
+    repo = GitRepo(str(temp_git_repo))
+    hashes = repo.get_all_commits()
+    cache_path = temp_git_repo / ".git" / WEIGHTS_CACHE_FILE
+
+    sizes = _commit_sizes(repo, hashes[:2])
+    assert cache_path.exists()
+    assert repo.read_cache(WEIGHTS_CACHE_FILE) == sizes
+
+    # Cached sizes are used as-is; only missing commits are measured
+    repo.write_cache(WEIGHTS_CACHE_FILE, {hashes[0]: 100})
+    sizes = _commit_sizes(repo, hashes)
+    assert sizes == {hashes[0]: 100, **{h: 5 - i for i, h in enumerate(hashes) if i}}
+
+    # Measuring rewrites the cache to hold exactly the commits of that run
+    repo.write_cache(WEIGHTS_CACHE_FILE, {hashes[0]: 100})
+    _commit_sizes(repo, hashes[1:3])
+    assert repo.read_cache(WEIGHTS_CACHE_FILE) == {hashes[1]: 4, hashes[2]: 3}
+
+
+def test_format_offset():
+    """Test UTC offsets are formatted the way git stores them."""
+    assert _format_offset(datetime.timedelta(hours=5)) == "+0500"
+    assert _format_offset(datetime.timedelta(hours=5, minutes=30)) == "+0530"
+    assert _format_offset(-datetime.timedelta(hours=3, minutes=30)) == "-0330"
+    assert _format_offset(datetime.timedelta(0)) == "+0000"
+    assert _format_offset(None) == "+0000"
+
+
+def test_resolve_tz():
+    """Test timezone names resolve through zoneinfo, dateutil or the local zone."""
+    assert _resolve_tz("Asia/Karachi") == ZoneInfo("Asia/Karachi")
+    assert isinstance(_resolve_tz(None), dateutil.tz.tzlocal)
+    assert isinstance(_resolve_tz("local"), dateutil.tz.tzlocal)
+
+    # Not an IANA name, but dateutil understands it
+    tz = _resolve_tz("UTC+3")
+    assert tz.utcoffset(datetime.datetime(2024, 1, 1)) == datetime.timedelta(hours=3)
+
+    with pytest.raises(ValueError, match="Unknown timezone"):
+        _resolve_tz("Not/AZone")
+
+
+def test_calculate_schedule_order(temp_git_repo):
+    """Test commits are scheduled oldest first, spaced by size, inside the window."""
+    repo = GitRepo(str(temp_git_repo))
+    hashes = repo.get_all_commits()
+
+    schedule = list(
+        calculate_schedule(
+            repo,
+            hashes,
+            datetime.date(2024, 1, 1),
+            datetime.date(2024, 1, 1),
+            "09:00",
+            "17:00",
+            "Asia/Karachi",
+            False,
+        )
+    )
+
+    assert [h for h, _ in schedule] == hashes[::-1]
+    # Sizes 1..5 give cumulative weights 0, 1, 3, 6, 10 out of 15 over 8 hours
+    start = 1704081600  # 2024-01-01 09:00 +0500
+    assert [git_date for _, git_date in schedule] == [
+        f"{start + 28800 * w // 15} +0500".encode() for w in (0, 1, 3, 6, 10)
+    ]
+
+
+def test_calculate_schedule_skip_weekends(temp_git_repo):
+    """Test skipping weekends leaves only weekdays in the schedule."""
+    repo = GitRepo(str(temp_git_repo))
+    commits = [f"{i:040x}" for i in range(50)]
+
+    def weekdays(skip_weekends):
+        schedule = calculate_schedule(
+            repo,
+            commits,
+            datetime.date(2024, 1, 1),
+            datetime.date(2024, 1, 14),
+            "09:00",
+            "17:00",
+            "UTC",
+            skip_weekends,
+            weighting="uniform",
+        )
+        return {
+            datetime.datetime.fromtimestamp(
+                int(git_date.split()[0]), datetime.timezone.utc
+            ).weekday()
+            for _, git_date in schedule
+        }
+
+    assert weekdays(True) == {0, 1, 2, 3, 4}
+    assert weekdays(False) == set(range(7))
+
+
+def test_calculate_schedule_invalid(temp_git_repo):
+    """Test invalid ranges and times are rejected."""
+    repo = GitRepo(str(temp_git_repo))
+    commits = repo.get_all_commits()
+    saturday, sunday = datetime.date(2024, 1, 6), datetime.date(2024, 1, 7)
+
+    with pytest.raises(ValueError, match="No valid days"):
+        list(calculate_schedule(repo, commits, saturday, sunday, "09:00", "17:00", "UTC", True))
+    with pytest.raises(ValueError, match="End time must be after start time"):
+        list(calculate_schedule(repo, commits, saturday, sunday, "17:00", "09:00", "UTC", False))
+    with pytest.raises(ValueError, match="Invalid time format"):
+        list(calculate_schedule(repo, commits, saturday, sunday, "9am", "17:00", "UTC", False))
+    with pytest.raises(ValueError, match="Unknown weighting"):
+        list(
+            calculate_schedule(
+                repo,
+                commits,
+                saturday,
+                sunday,
+                "09:00",
+                "17:00",
+                "UTC",
+                False,
+                weighting="random",
+            )
+        )
+
+
+def test_format_git_date():
+    """Test raw git dates are shown in their own UTC offset."""
+    assert cli._format_git_date(b"1704081600 +0500") == "2024-01-01T09:00:00+05:00"
+    assert cli._format_git_date(b"1704081600 -0330") == "2024-01-01T00:30:00-03:30"
+
+
+def test_parse_date():
+    """Test dates parse from ISO format and, through dateutil, other formats."""
+    assert cli._parse_date("2024-01-05") == datetime.date(2024, 1, 5)
+    assert cli._parse_date("Jan 5 2024") == datetime.date(2024, 1, 5)
+
+
+def test_calculate_schedule_empty_range(temp_git_repo):
+    """Test an empty commit range yields nothing instead of failing."""
+    repo = GitRepo(str(temp_git_repo))
+
+    for weighting in ("size", "uniform"):
+        schedule = calculate_schedule(
+            repo,
+            repo.iter_log_hashes("HEAD..HEAD"),
+            datetime.date(2024, 1, 1),
+            datetime.date(2024, 1, 5),
+            "09:00",
+            "17:00",
+            "UTC",
+            False,
+            weighting=weighting,
+        )
+        assert list(schedule) == []
+
+
+@pytest.mark.parametrize(
+    "day,timezone_str,expected",
+    [
+        # Spring forward: 02:02:18 does not exist and resolves to standard time
+        (datetime.date(2024, 3, 31), "Europe/Berlin", b"1711846938 +0100"),
+        (datetime.date(2024, 3, 10), "America/New_York", b"1710054138 -0500"),
+        # Fall back: 02:02:18 happens twice and resolves to standard time
+        (datetime.date(2024, 10, 27), "Europe/Berlin", b"1729990938 +0100"),
+        (datetime.date(2024, 11, 3), "America/New_York", b"1730617338 -0500"),
+    ],
+)
+def test_calculate_schedule_dst_change(temp_git_repo, day, timezone_str, expected):
+    """Test commits on a DST change day keep their wall-clock time."""
+    repo = GitRepo(str(temp_git_repo))
+    # Uniform weighting never reads the commits, so placeholder hashes will do
+    commits = [f"{i:040x}" for i in reversed(range(200))]
+
+    schedule = list(
+        calculate_schedule(
+            repo,
+            commits,
+            day,
+            day,
+            "00:00",
+            "23:59",
+            timezone_str,
+            False,
+            weighting="uniform",
+        )
+    )
+
+    assert len(schedule) == 200
+    # 17/200 of the way through a 23:59 window is 02:02:18 wall-clock time
+    assert schedule[17] == (f"{17:040x}", expected)
+
+
+@pytest.mark.parametrize(
+    "day,timezone_str",
+    [
+        (datetime.date(2024, 3, 31), "Europe/Berlin"),
+        (datetime.date(2024, 3, 10), "America/New_York"),
+    ],
+)
+@pytest.mark.parametrize(
+    "count,last_time",
+    [(200, datetime.time(23, 51, 48)), (2000, datetime.time(23, 58, 16))],
+)
+def test_calculate_schedule_strictly_increasing(temp_git_repo, day, timezone_str, count, last_time):
+    """Test timestamps keep increasing across a spring-forward gap, then catch up."""
+    repo = GitRepo(str(temp_git_repo))
+    commits = [f"{i:040x}" for i in reversed(range(count))]
+
+    schedule = calculate_schedule(
+        repo,
+        commits,
+        day,
+        day,
+        "00:00",
+        "23:59",
+        timezone_str,
+        False,
+        weighting="uniform",
+    )
+    epochs = [int(git_date.split()[0]) for _, git_date in schedule]
+
+    assert all(later > earlier for earlier, later in zip(epochs, epochs[1:]))
+    # Commits after the gap are back on their wall-clock times by the end of the day
+    assert datetime.datetime.fromtimestamp(epochs[-1], ZoneInfo(timezone_str)).time() == last_time
+
+
+@pytest.mark.parametrize("inline", [True, False])
+def test_arrange(temp_git_repo, monkeypatch, inline):
+    """Test arrange rewrites dates with the schedule inlined or loaded from a file."""
+    repo = GitRepo(str(temp_git_repo))
+    if not repo.has_filter_repo():
+        pytest.skip("git-filter-repo not installed")
+
+    # Schedule files go to a temporary directory whose path needs quoting
+    tmpdir = temp_git_repo.parent / 'it\'s "tmp"'
+    tmpdir.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(tmpdir))
+    schedule_files = []
+    mkstemp = tempfile.mkstemp
+
+    def recording_mkstemp(*args, **kwargs):
+        fd, name = mkstemp(*args, **kwargs)
+        schedule_files.append(name)
+        return fd, name
+
+    monkeypatch.setattr(tempfile, "mkstemp", recording_mkstemp)
+    if not inline:
+        monkeypatch.setattr(cli, "_INLINE_SCHEDULE_LIMIT", 0)
+    expected = [
+        git_date.decode()
+        for _, git_date in calculate_schedule(
+            repo,
+            repo.iter_log_hashes("HEAD~4..HEAD"),
+            datetime.date(2024, 1, 1),
+            datetime.date(2024, 1, 5),
+            "09:00",
+            "17:00",
+            "UTC",
+            False,
+        )
+    ]
+
+    result = CliRunner().invoke(
+        cli.app,
+        [
+            "arrange",
+            "--commits",
+            "4",
+            "--start-date",
+            "2024-01-01",
+            "--end-date",
+            "2024-01-05",
+            "--start-time",
+            "09:00",
+            "--end-time",
+            "17:00",
+            "--timezone",
+            "UTC",
+            "--no-skip-weekends",
+            "--force",
+            "--path",
+            str(temp_git_repo),
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    log = repo._run_command(["git", "log", "--reverse", "--format=%ad|%cd", "--date=raw"])
+    assert log.stdout.splitlines()[1:] == [f"{d}|{d}" for d in expected]
+    assert len(schedule_files) == (0 if inline else 1)
+    assert list(tmpdir.iterdir()) == []  # a schedule file is removed afterwards
+
+
+def test_arrange_uniform_preview(temp_git_repo):
+    """Test --uniform previews evenly spaced dates and declining leaves history alone."""
+    repo = GitRepo(str(temp_git_repo))
+    original = repo.get_all_commits()
+
+    result = CliRunner().invoke(
+        cli.app,
+        [
+            "arrange",
+            "--commits",
+            "4",
+            "--start-date",
+            "2024-01-01",
+            "--end-date",
+            "2024-01-01",
+            "--start-time",
+            "09:00",
+            "--end-time",
+            "17:00",
+            "--timezone",
+            "UTC",
+            "--no-skip-weekends",
+            "--uniform",
+            "--path",
+            str(temp_git_repo),
+        ],
+        input="n\n",
+    )
+
+    # Commits of sizes 2..5 spaced evenly over the 8 hour window, oldest first
+    for commit_hash, hour in zip(original[3::-1], (9, 11, 13, 15)):
+        assert f"{commit_hash[:8]} -> 2024-01-01T{hour:02d}:00:00+00:00" in result.output
+    assert "Aborted" in result.output
+    assert repo.get_all_commits() == original
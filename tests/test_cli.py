@@ -0,0 +1,57 @@
+"""Tests for cli module."""
+
+import logging
+
+import pytest
+
+from gitauth.cli import _hold_logs, setup_logging
+
+HELD_LOGGER = "gitauth.tests.held"
+
+
+def test_hold_logs(caplog):
+    """Test records logged inside the block are emitted only after it ends."""
+    held_logger = logging.getLogger(HELD_LOGGER)
+    handlers = list(held_logger.handlers)
+    caplog.set_level(logging.INFO)
+
+    with _hold_logs(HELD_LOGGER):
+        held_logger.info("Held message")
+        assert caplog.records == []
+        assert held_logger.propagate is False
+
+    assert [r.getMessage() for r in caplog.records] == ["Held message"]
+    assert held_logger.propagate is True
+    assert held_logger.handlers == handlers
+
+
+def test_hold_logs_exception(caplog):
+    """Test held records are emitted and the logger restored when the block raises."""
+    held_logger = logging.getLogger(HELD_LOGGER)
+    handlers = list(held_logger.handlers)
+    caplog.set_level(logging.INFO)
+
+    with pytest.raises(RuntimeError), _hold_logs(HELD_LOGGER):
+        held_logger.info("Held message")
+        raise RuntimeError("prompt failed")
+
+    assert [r.getMessage() for r in caplog.records] == ["Held message"]
+    assert held_logger.propagate is True
+    assert held_logger.handlers == handlers
+
+
+def test_setup_logging_idempotent(monkeypatch):
+    """Test a second call installs no extra handler and applies the new level."""
+    root = logging.getLogger()
+    monkeypatch.setattr(root, "handlers", [])
+    level = root.level
+
+    try:
+        setup_logging()
+        assert root.level == logging.INFO
+        setup_logging(verbose=True)
+
+        assert len(root.handlers) == 1
+        assert root.level == logging.DEBUG
+    finally:
+        root.setLevel(level)
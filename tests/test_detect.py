@@ -6,7 +6,13 @@ from pathlib import Path
 
 import pytest
 
-from gitauth.core.detect import Author, detect_authors, find_commits_by_author
+from gitauth.core.detect import (
+    Author,
+    _detect_authors_cached,
+    detect_authors,
+    find_commits_by_author,
+    find_commits_by_authors,
+)
 from gitauth.core.git_utils import GitRepo
 
 
@@ -75,6 +81,30 @@ def test_detect_authors(multi_author_repo):
     assert "charlie@example.com" in author_emails
 
 
+def test_detect_authors_cache_invalidated_by_new_commit(multi_author_repo):
+    """Test cached authors are refreshed once history changes."""
+    repo = GitRepo(str(multi_author_repo))
+    assert len(detect_authors(repo)) == 3
+    assert (multi_author_repo / ".git" / "gitauth-authors.json").exists()
+
+    os.system(f"cd {multi_author_repo} && git config user.name 'Dave'")
+    os.system(f"cd {multi_author_repo} && git config user.email 'dave@example.com'")
+    os.system(f"cd {multi_author_repo} && git commit --allow-empty -m 'Commit 3'")
+
+    authors = detect_authors(repo)
+    assert len(authors) == 4
+    assert Author("Dave", "dave@example.com") in authors
+
+
+def test_detect_authors_reuses_repo(multi_author_repo, monkeypatch):
+    """Test a cache miss scans with the caller's GitRepo instead of opening a new one."""
+    repo = GitRepo(str(multi_author_repo))
+    _detect_authors_cached.cache_clear()
+    monkeypatch.setattr(GitRepo, "_validate_repo", lambda self: pytest.fail("repo reopened"))
+
+    assert len(detect_authors(repo)) == 3
+
+
 def test_find_commits_by_email(multi_author_repo):
     """Test finding commits by author email."""
     repo = GitRepo(str(multi_author_repo))
@@ -93,6 +123,56 @@ def test_find_commits_by_name(multi_author_repo):
     assert all(c['author_name'] == "Bob" for c in commits)
 
 
+def test_find_commits_by_name_and_email(multi_author_repo):
+    """Test name and email together must both match."""
+    repo = GitRepo(str(multi_author_repo))
+
+    commits = find_commits_by_author(repo, email="alice@example.com", name="Alice")
+    assert len(commits) == 1
+    assert commits[0]['author_name'] == "Alice"
+
+    assert find_commits_by_author(repo, email="alice@example.com", name="Bob") == []
+
+
+def test_find_commits_email_is_literal(multi_author_repo):
+    """Test regex characters in the email are matched literally."""
+    repo = GitRepo(str(multi_author_repo))
+    assert find_commits_by_author(repo, email="alice@example.co.") == []
+
+
+def test_find_commits_by_authors(multi_author_repo):
+    """Test several authors are matched by exact identity in one lookup."""
+    repo = GitRepo(str(multi_author_repo))
+    authors = [
+        Author("Alice", "alice@example.com"),
+        Author("Charlie", "charlie@example.com"),
+        Author("Bob", "alice@example.com"),
+    ]
+
+    commits = find_commits_by_authors(repo, authors)
+
+    assert [c['author_name'] for c in commits] == ["Charlie", "Alice"]
+    assert len(find_commits_by_authors(repo, authors, limit=1)) == 1
+    assert find_commits_by_authors(repo, []) == []
+
+
+def test_find_commits_unicode_line_breaks(multi_author_repo):
+    """Test names and subjects with characters str.splitlines() breaks on."""
+    repo = GitRepo(str(multi_author_repo))
+    name = "Eve\u2028Smith\x85"
+    subject = "Page\x0bbreak\x0cand\u2028more"
+    repo._run_command(
+        ["git", "commit", "--allow-empty", "-m", subject],
+        env={"GIT_AUTHOR_NAME": name, "GIT_AUTHOR_EMAIL": "eve@example.com"}
+    )
+
+    commits = find_commits_by_author(repo, email="eve@example.com")
+
+    assert len(commits) == 1
+    assert commits[0]['author_name'] == name
+    assert commits[0]['subject'] == subject
+
+
 def test_find_commits_limit(multi_author_repo):
     """Test limiting number of commits returned."""
     repo = GitRepo(str(multi_author_repo))
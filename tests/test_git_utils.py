@@ -1,6 +1,7 @@
 """Tests for git_utils module."""
 
 import os
+import subprocess
 import tempfile
 from pathlib import Path
 
@@ -60,6 +61,23 @@ def test_is_clean_false(temp_git_repo):
     assert repo.is_clean() is False
 
 
+def test_is_clean_false_modified_tracked(temp_git_repo):
+    """Test is_clean returns False when a tracked file is modified."""
+    repo = GitRepo(str(temp_git_repo))
+    (temp_git_repo / "test.txt").write_text("changed content")
+
+    assert repo.is_clean() is False
+
+
+def test_is_clean_ignores_stat_only_change(temp_git_repo):
+    """Test is_clean returns True when a tracked file is only touched."""
+    repo = GitRepo(str(temp_git_repo))
+    test_file = temp_git_repo / "test.txt"
+    os.utime(test_file, (test_file.stat().st_atime, test_file.stat().st_mtime + 60))
+
+    assert repo.is_clean() is True
+
+
 def test_get_current_branch(temp_git_repo):
     """Test getting current branch name."""
     repo = GitRepo(str(temp_git_repo))
@@ -67,12 +85,138 @@ def test_get_current_branch(temp_git_repo):
     assert branch in ["main", "master"]  # Could be either depending on Git version
 
 
+def test_get_remotes(temp_git_repo):
+    """Test listing remotes, including names containing dots."""
+    repo = GitRepo(str(temp_git_repo))
+    assert repo.get_remotes() == {}
+
+    os.system(f"cd {temp_git_repo} && git remote add origin https://example.com/a.git")
+    os.system(f"cd {temp_git_repo} && git remote add my.fork https://example.com/b.git")
+    os.system(f"cd {temp_git_repo} && git remote set-url --push origin https://example.com/push.git")
+
+    assert repo.get_remotes() == {
+        "origin": "https://example.com/a.git",
+        "my.fork": "https://example.com/b.git",
+    }
+
+
+def test_add_remotes(temp_git_repo):
+    """Test adding missing remotes without touching existing ones."""
+    repo = GitRepo(str(temp_git_repo))
+    os.system(f"cd {temp_git_repo} && git remote add origin https://example.com/a.git")
+
+    repo.add_remotes({
+        "origin": "https://example.com/other.git",
+        "my.fork": 'https://example.com/b "quoted".git',
+    })
+
+    assert repo.get_remotes() == {
+        "origin": "https://example.com/a.git",
+        "my.fork": 'https://example.com/b "quoted".git',
+    }
+    fetch = repo._run_command(["git", "config", "remote.my.fork.fetch"]).stdout.strip()
+    assert fetch == "+refs/heads/*:refs/remotes/my.fork/*"
+
+
+def test_git_dir(temp_git_repo):
+    """Test the git directory resolves from a subdirectory and a worktree."""
+    (temp_git_repo / "sub").mkdir()
+    repo = GitRepo(str(temp_git_repo / "sub"))
+    assert repo.git_dir.resolve() == (temp_git_repo / ".git").resolve()
+    assert repo.git_common_dir.resolve() == (temp_git_repo / ".git").resolve()
+
+    worktree = temp_git_repo.parent / "worktree"
+    os.system(f"cd {temp_git_repo} && git worktree add -q {worktree}")
+    repo = GitRepo(str(worktree))
+    assert repo.git_dir.resolve() == (temp_git_repo / ".git" / "worktrees" / "worktree").resolve()
+    assert repo.git_common_dir.resolve() == (temp_git_repo / ".git").resolve()
+
+    repo.add_remotes({"origin": "https://example.com/a.git"})
+    assert GitRepo(str(temp_git_repo)).get_remotes() == {"origin": "https://example.com/a.git"}
+
+
+def test_cache(temp_git_repo):
+    """Test JSON caches round-trip and tolerate missing or malformed files."""
+    repo = GitRepo(str(temp_git_repo))
+    assert repo.read_cache("gitauth-test.json") == {}
+
+    repo.write_cache("gitauth-test.json", {"key": [1, 2]})
+    assert repo.read_cache("gitauth-test.json") == {"key": [1, 2]}
+
+    (temp_git_repo / ".git" / "gitauth-test.json").write_text("[not a dict]")
+    assert repo.read_cache("gitauth-test.json") == {}
+
+
 def test_has_commits_true(temp_git_repo):
     """Test has_commits returns True when repository has commits."""
     repo = GitRepo(str(temp_git_repo))
     assert repo.has_commits() is True
 
 
+def test_resolve(temp_git_repo):
+    """Test resolving revisions through the batch process."""
+    with GitRepo(str(temp_git_repo)) as repo:
+        head = repo.resolve("HEAD")
+
+        assert head == repo.get_all_commits()[0]
+        assert repo.resolve("HEAD^{commit}") == head
+        assert repo.resolve("HEAD^") is None  # root commit has no parent
+        assert repo.resolve("does-not-exist") is None
+
+    assert repo._batch is None
+
+
+def test_count_commits_by_all_authors(temp_git_repo):
+    """Test counting commits for all authors at once."""
+    repo = GitRepo(str(temp_git_repo))
+    counts = repo.count_commits_by_all_authors()
+
+    assert counts == {('test@example.com', 'Test User'): 1}
+
+    # Only newlines separate records, not the other characters splitlines() breaks on
+    repo._run_command(
+        ["git", "commit", "--allow-empty", "-m", "Second"],
+        env={"GIT_AUTHOR_NAME": "Eve\u2028Smith", "GIT_AUTHOR_EMAIL": "eve@example.com"}
+    )
+    assert repo.count_commits_by_all_authors()[('eve@example.com', 'Eve\u2028Smith')] == 1
+
+
+def test_ensure_commit_graph(temp_git_repo):
+    """Test ensure_commit_graph writes a commit-graph file."""
+    repo = GitRepo(str(temp_git_repo))
+    repo.ensure_commit_graph()
+
+    assert (temp_git_repo / ".git" / "objects" / "info" / "commit-graph").exists()
+
+
+def test_command_environment(temp_git_repo, monkeypatch):
+    """Test that git commands run with our config appended to the caller's."""
+    monkeypatch.setenv("GIT_CONFIG_PARAMETERS", "'user.name=Env User'")
+    repo = GitRepo(str(temp_git_repo))
+
+    assert repo._run_command(["git", "config", "user.name"]).stdout.strip() == "Env User"
+    assert repo._run_command(["git", "config", "core.commitGraph"]).stdout.strip() == "true"
+    assert repo._env["GIT_OPTIONAL_LOCKS"] == "0"
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc")
+def test_close_fds(temp_git_repo):
+    """Test only short-lived commands leave inheritable descriptors open."""
+    repo = GitRepo(str(temp_git_repo))
+    read_fd, write_fd = os.pipe()
+    os.set_inheritable(write_fd, True)
+    cmd = ["git", "-c", "alias.fds=!ls /proc/self/fd", "fds"]
+
+    try:
+        assert str(write_fd) in repo._run_command(cmd).stdout.split()
+        assert str(write_fd) not in repo._run_command(cmd, close_fds=True).stdout.split()
+        with repo._popen(cmd, stdout=subprocess.PIPE, text=True) as proc:
+            assert str(write_fd) not in proc.stdout.read().split()
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+
+
 def test_validate_email_valid():
     """Test email validation with valid emails."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -7,7 +7,12 @@ from pathlib import Path
 import pytest
 
 from gitauth.core.git_utils import GitRepo
-from gitauth.core.rewrite import get_rewrite_engine, rewrite_history, RewriteError
+from gitauth.core.rewrite import (
+    get_rewrite_engine,
+    rewrite_history,
+    rewrite_history_multi,
+    RewriteError,
+)
 
 
 @pytest.fixture
@@ -90,6 +95,60 @@ def test_rewrite_history_missing_criteria(temp_git_repo):
         )
 
 
+def test_rewrite_history_multi_empty_mapping(temp_git_repo):
+    """Test rewrite_history_multi raises error for an empty mapping."""
+    repo = GitRepo(str(temp_git_repo))
+
+    with pytest.raises(RewriteError, match="at least one author"):
+        rewrite_history_multi(repo, {})
+
+
+def test_rewrite_history_multi_invalid_email(temp_git_repo):
+    """Test rewrite_history_multi raises error for invalid email."""
+    repo = GitRepo(str(temp_git_repo))
+
+    with pytest.raises(RewriteError, match="Invalid email format"):
+        rewrite_history_multi(
+            repo,
+            {("old@example.com", "Old Name"): ("New Name", "invalid-email")}
+        )
+
+
+@pytest.mark.parametrize("use_filter_repo", [False, True])
+def test_rewrite_history_multi(temp_git_repo, use_filter_repo):
+    """Test rewrite_history_multi rewrites every mapped author in one pass."""
+    repo = GitRepo(str(temp_git_repo))
+    if use_filter_repo and not repo.has_filter_repo():
+        pytest.skip("git-filter-repo is not installed")
+
+    # Add commits by a second author and by one that is not mapped
+    for name, email in [("Other Name", "other@example.com"), ("Kept", "kept@example.com")]:
+        (temp_git_repo / f"{name}.txt").write_text(name)
+        os.system(f"cd {temp_git_repo} && git add '{name}.txt'")
+        os.system(
+            f"cd {temp_git_repo} && git -c user.name='{name}' -c user.email='{email}' "
+            f"commit -m 'Commit by {name}'"
+        )
+
+    rewrite_history_multi(
+        repo,
+        {
+            ("old@example.com", "Old Name"): ("New Name", "new@example.com"),
+            ("other@example.com", "Other Name"): ("Second Name", "second@example.com"),
+        },
+        use_filter_repo=use_filter_repo
+    )
+
+    commits = [repo.get_commit_info(c) for c in repo.get_all_commits()]
+    identities = [(c['author_name'], c['author_email']) for c in commits]
+    assert identities.count(("New Name", "new@example.com")) == 3
+    assert identities.count(("Second Name", "second@example.com")) == 1
+    assert identities.count(("Kept", "kept@example.com")) == 1
+    assert {c['committer_email'] for c in commits} == {
+        "new@example.com", "second@example.com", "kept@example.com"
+    }
+
+
 # Note: Full integration tests for actual rewriting would require
 # git-filter-repo or would modify the git history, which is complex
 # to test in unit tests. These tests focus on validation logic.